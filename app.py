@@ -0,0 +1,31 @@
+"""ASGI entry point: the dashboard, warmed up at boot, plus a readiness route.
+
+    streamlit run app.py            (or: uvicorn app:app)
+
+The server starts warming the dataset and figure caches as it boots (see
+``fee_impact.warmup``). ``/ready`` answers 503 until the warm-up is done and
+200 after, with its status as JSON: point the platform's health check at it
+so a new worker only gets traffic once its caches are hot.
+``streamlit run 🏠_Home.py`` still works, without warm-up.
+"""
+
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from fee_impact import warmup
+
+
+@asynccontextmanager
+async def lifespan(app):
+    warmup.start()
+    yield
+
+
+async def ready(request):
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready() else 503)
+
+
+app = st.App("🏠_Home.py", lifespan=lifespan, routes=[Route("/ready", ready)])
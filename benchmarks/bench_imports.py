@@ -0,0 +1,115 @@
+"""Import-time profile of every page, checked against a budget.
+
+Each page's module-level imports run in a fresh Python process under
+``-X importtime``, so a page is charged for everything it pulls in before
+its first line of output, as on a cold start after a deploy:
+
+- import_ms: wall time of the page's imports (median of ``--runs``)
+- top: the heaviest top-level modules by cumulative import time
+
+Results are written as JSON and printed; ``--profile-dir`` also keeps the
+raw ``-X importtime`` output of each page for tools such as tuna. The
+budget is ``import_ms`` in benchmarks/thresholds.json (per page under
+``pages``), or ``--budget-ms``; the exit status is 1 when a page exceeds it.
+
+    python benchmarks/bench_imports.py [--runs 5] [--budget-ms 2000] [--profile-dir DIR]
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_pages import ROOT, THRESHOLDS, check, page_name, page_paths
+
+DEFAULT_OUT = os.path.join(ROOT, "benchmarks", "results", "imports.json")
+TOP = 10
+
+_line = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def page_imports(path):
+    """Source of the module-level import statements of ``path``."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def profile(path):
+    """Import ``path``'s dependencies in a fresh process: (wall ms, importtime log)."""
+    code = ("import time\n_start = time.perf_counter()\n" + page_imports(path) +
+            "\nprint((time.perf_counter() - _start) * 1e3)")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         cwd=ROOT, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"{page_name(path)} imports failed:\n{out.stderr[-2000:]}")
+    return float(out.stdout.strip().splitlines()[-1]), out.stderr
+
+
+def top_modules(log, n=TOP):
+    """Top-level modules of an importtime log by cumulative ms, heaviest first."""
+    top = []
+    for match in _line.finditer(log):
+        if len(match.group(3)) == 1:     # depth 0: imported by the page itself
+            top.append((match.group(4), int(match.group(2)) / 1e3))
+    return sorted(top, key=lambda item: -item[1])[:n]
+
+
+def measure(path, runs, profile_dir=None):
+    timings = []
+    for _ in range(runs):
+        wall, log = profile(path)
+        timings.append(wall)
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        with open(os.path.join(profile_dir, page_name(path) + ".importtime.txt"), "w") as f:
+            f.write(log)
+    return {"import_ms": statistics.median(timings),
+            "top": [[module, round(ms, 1)] for module, ms in top_modules(log)]}
+
+
+def print_table(pages):
+    for name, result in pages.items():
+        heaviest = ", ".join(f"{module} {ms:.0f}" for module, ms in result["top"][:4])
+        print(f"{name:40}{result['import_ms']:>10.1f} ms   {heaviest}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per page")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--budget-ms", type=float, help="import budget for every page, "
+                                                        "instead of the thresholds file")
+    parser.add_argument("--profile-dir", help="keep each page's raw -X importtime output here")
+    args = parser.parse_args()
+
+    pages = {page_name(path): measure(path, args.runs, args.profile_dir) for path in page_paths()}
+    report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "runs": args.runs,
+                       "python": sys.version.split()[0]},
+              "pages": pages}
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print_table(pages)
+    print(f"\nreport written to {args.out}")
+
+    if args.budget_ms is not None:
+        thresholds = {"default": {"import_ms": args.budget_ms}}
+    else:
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    failures = check(pages, thresholds)
+    for failure in failures:
+        print(f"THRESHOLD EXCEEDED {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
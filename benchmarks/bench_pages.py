@@ -0,0 +1,186 @@
+"""Headless cold/warm rerun benchmarks for every page.
+
+Each page runs in its own fresh Python process through Streamlit's AppTest
+harness (no browser, no server, no network):
+
+- cold_ms: first run, including the page's imports and empty caches
+- warm_ms: median of the following reruns
+- switch_cold_ms / switch_warm_ms: changes of the metric selectbox (the one
+  keyed ``metric``, on Chain Reaction and Conclusion), the first time each
+  option is shown and once cached
+- peak_rss_mb: peak resident memory of the worker process
+
+Results are written as JSON, printed as a table, compared with an optional
+earlier report and checked against benchmarks/thresholds.json; the exit
+status is 1 when any threshold is exceeded.
+
+    python benchmarks/bench_pages.py [--runs 10] [--out report.json] [--baseline old.json]
+
+``--data-dir`` runs the pages against another copy of the exports, such as
+one written by ``python -m fee_impact.synthetic``.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS = os.path.join(ROOT, "benchmarks", "thresholds.json")
+DEFAULT_OUT = os.path.join(ROOT, "benchmarks", "results", "pages.json")
+# key of the metric switch timed by switch_cold_ms / switch_warm_ms
+SWITCH_KEY = "metric"
+
+
+def page_paths():
+    return [os.path.join(ROOT, "🏠_Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def page_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+###################################
+############# WORKER ##############
+###################################
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1e3
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def measure(path, runs):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(path, default_timeout=300)
+    result = {"cold_ms": _timed_run(at)}
+    result["warm_ms"] = statistics.median(_timed_run(at) for _ in range(runs))
+
+    if any(box.key == SWITCH_KEY for box in at.selectbox):
+        options = list(at.selectbox(key=SWITCH_KEY).options)
+        # the first option was shown by the runs above, so only the others are cold
+        cold, warm = [], []
+        for timings, shown in ((cold, options[1:]), (warm, options)):
+            for option in shown:
+                at.selectbox(key=SWITCH_KEY).select(option)
+                timings.append(_timed_run(at))
+        result["switch_cold_ms"] = statistics.median(cold)
+        result["switch_warm_ms"] = statistics.median(warm)
+
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result["charts"] = len(at.get("plotly_chart"))
+    return result
+
+
+###################################
+############# REPORT ##############
+###################################
+
+def run_worker(path, runs, data_dir=None):
+    env = dict(os.environ)
+    if data_dir:
+        env["FEE_IMPACT_DATA_DIR"] = os.path.abspath(data_dir)
+    out = subprocess.run([sys.executable, __file__, "--worker", path, "--runs", str(runs)],
+                         cwd=ROOT, capture_output=True, text=True, env=env)
+    if out.returncode != 0:
+        raise RuntimeError(f"{page_name(path)} failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _versions():
+    import importlib.metadata as md
+    versions = {"python": platform.python_version()}
+    for dist in ("streamlit", "pandas", "plotly", "pyarrow"):
+        try:
+            versions[dist] = md.version(dist)
+        except md.PackageNotFoundError:
+            versions[dist] = None
+    return versions
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def check(pages, thresholds):
+    failures = []
+    for name, result in pages.items():
+        limits = {**thresholds.get("default", {}), **thresholds.get("pages", {}).get(name, {})}
+        for metric, limit in limits.items():
+            if metric in result and result[metric] > limit:
+                failures.append(f"{name}: {metric} {result[metric]:.1f} > {limit}")
+    return failures
+
+
+def print_table(pages, baseline=None):
+    metrics = ["cold_ms", "warm_ms", "switch_cold_ms", "switch_warm_ms", "peak_rss_mb"]
+    print(f"{'page':40}" + "".join(f"{m:>18}" for m in metrics))
+    for name, result in pages.items():
+        cells = []
+        for metric in metrics:
+            value = result.get(metric)
+            if value is None:
+                cells.append(f"{'-':>18}")
+                continue
+            cell = f"{value:.1f}"
+            old = ((baseline or {}).get(name) or {}).get(metric)
+            if old:
+                cell += f" ({(value - old) / old:+.0%})"
+            cells.append(f"{cell:>18}")
+        print(f"{name:40}" + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="warm reruns per page")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--data-dir", help="directory of dfN.csv files to use instead of data/")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.runs)))
+        return 0
+
+    pages = {page_name(path): run_worker(path, args.runs, args.data_dir) for path in page_paths()}
+    report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": _git_rev(),
+                       "runs": args.runs, "data_dir": args.data_dir, **_versions()},
+              "pages": pages}
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["pages"]
+    print_table(pages, baseline)
+    print(f"\nreport written to {args.out}")
+
+    with open(args.thresholds) as f:
+        failures = check(pages, json.load(f))
+    for failure in failures:
+        print(f"THRESHOLD EXCEEDED {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
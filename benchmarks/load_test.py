@@ -0,0 +1,193 @@
+"""Concurrent-session load test against a local Streamlit server.
+
+Starts ``streamlit run 🏠_Home.py`` on a free port and opens simulated viewer
+sessions over the same websocket protocol a browser uses. For each level of
+concurrency N, N sessions load a page at once and then rerun it; the report
+gives:
+
+- load_p50_ms: first run of a new session
+- p50_ms / p99_ms: rerun latency, from the rerun request to script_finished
+- reruns_per_s: completed runs per second across all sessions
+- rss_mb: server resident memory with the N sessions still connected
+- rss_per_session_mb: growth over the server before the N sessions
+  connected, divided by N
+
+The server is warmed up by one session first, so every level measures
+serving from shared caches; with data and figures held once per process, the
+per-session cost should stay flat as N grows.
+
+    python benchmarks/load_test.py [--sessions 1 10 100] [--reruns 5] [--page Chain_Reaction]
+
+``--page`` is the page's URL path (the Home page by default). Needs the
+``websockets`` package, and ``ps`` to read the server's memory.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import AsyncExitStack
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOME = os.path.join(ROOT, "🏠_Home.py")
+DEFAULT_OUT = os.path.join(ROOT, "benchmarks", "results", "load.json")
+
+
+###################################
+############# SERVER ##############
+###################################
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, data_dir=None, timeout=60):
+    env = dict(os.environ)
+    if data_dir:
+        env["FEE_IMPACT_DATA_DIR"] = os.path.abspath(data_dir)
+    # a file, not a pipe: nobody drains the server's log while it is measured
+    log = tempfile.TemporaryFile()
+    server = subprocess.Popen([sys.executable, "-m", "streamlit", "run", HOME,
+                               "--server.headless", "true", "--server.port", str(port),
+                               "--browser.gatherUsageStats", "false"],
+                              cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"server exited:\n{log.read().decode()[-2000:]}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"server did not answer on port {port} within {timeout}s")
+
+
+def rss_mb(pid):
+    out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True)
+    return int(out.stdout.strip()) / 1024
+
+
+###################################
+############# CLIENT ##############
+###################################
+
+async def connect(port):
+    return await websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream",
+                                    subprotocols=["streamlit"], max_size=None)
+
+
+async def run_page(ws, page):
+    """Request a run of ``page`` and return its latency in ms once it finishes."""
+    msg = BackMsg()
+    msg.rerun_script.page_name = page
+    start = time.perf_counter()
+    await ws.send(msg.SerializeToString())
+    while True:
+        forward = ForwardMsg()
+        forward.ParseFromString(await ws.recv())
+        kind = forward.WhichOneof("type")
+        if kind == "page_not_found":
+            raise RuntimeError(f"no page {page!r}")
+        if kind == "script_finished":
+            if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                raise RuntimeError(f"page {page!r} failed to compile")
+            return (time.perf_counter() - start) * 1e3
+
+
+async def session(ws, page, reruns):
+    load = await run_page(ws, page)
+    return load, [await run_page(ws, page) for _ in range(reruns)]
+
+
+async def level(port, pid, page, sessions, reruns):
+    before = rss_mb(pid)
+    async with AsyncExitStack() as stack:
+        sockets = [await stack.enter_async_context(await connect(port)) for _ in range(sessions)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*(session(ws, page, reruns) for ws in sockets))
+        elapsed = time.perf_counter() - start
+        after = rss_mb(pid)
+
+    loads = [load for load, _ in results]
+    runs = sorted(ms for _, timings in results for ms in timings)
+    return {
+        "sessions": sessions,
+        "load_p50_ms": statistics.median(loads),
+        "p50_ms": statistics.median(runs) if runs else None,
+        "p99_ms": runs[min(len(runs) - 1, int(0.99 * len(runs)))] if runs else None,
+        "reruns_per_s": sessions * (reruns + 1) / elapsed,
+        "rss_mb": after,
+        "rss_per_session_mb": (after - before) / sessions,
+    }
+
+
+###################################
+############# REPORT ##############
+###################################
+
+def print_table(levels):
+    metrics = ["load_p50_ms", "p50_ms", "p99_ms", "reruns_per_s", "rss_mb", "rss_per_session_mb"]
+    print(f"{'sessions':>10}" + "".join(f"{m:>20}" for m in metrics))
+    for result in levels:
+        cells = "".join(f"{'-':>20}" if result[m] is None else f"{result[m]:>20.1f}" for m in metrics)
+        print(f"{result['sessions']:>10}" + cells)
+
+
+async def run(args):
+    port = free_port()
+    server = start_server(port, args.data_dir)
+    try:
+        warm = await connect(port)
+        async with warm:
+            await session(warm, args.page, 1)
+        idle = rss_mb(server.pid)
+        levels = []
+        for sessions in args.sessions:
+            levels.append(await level(port, server.pid, args.page, sessions, args.reruns))
+        return idle, levels
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100],
+                        help="numbers of concurrent sessions to measure, in order")
+    parser.add_argument("--reruns", type=int, default=5, help="reruns per session after its first run")
+    parser.add_argument("--page", default="", help="URL path of the page (default: Home)")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--data-dir", help="directory of dfN.csv files to use instead of data/")
+    args = parser.parse_args()
+
+    idle, levels = asyncio.run(run(args))
+    report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "page": args.page or "Home",
+                       "reruns": args.reruns, "data_dir": args.data_dir, "idle_rss_mb": idle},
+              "levels": levels}
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"idle server after warm-up: {idle:.1f} MB")
+    print_table(levels)
+    print(f"\nreport written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""Shared data and chart helpers for the Uniswap Frontend Fee Impact pages."""
+
+import pandas as pd
+
+# Datasets and figures are loaded once per process and handed to every
+# session. Under copy-on-write, whatever a page derives from a shared frame
+# (a filter, a column, an assign) never writes through to it. pandas 3
+# always copies on write; pandas 2 has to opt in. Writes into a shared frame
+# itself fail on its read-only arrays (see fee_impact.cache.freeze), and
+# cached figures are only handed out as copies (fee_impact.figures).
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
@@ -0,0 +1,108 @@
+"""Per-period aggregates of every metric, materialized at refresh time.
+
+For each metric and segment of df1, df2, df3, df5, df9 and df11 the table
+holds, per fee period, the number of days, the sum, the daily mean and
+median, and the change in the daily mean from the previous period and from
+the "no fee" period. These are the numbers the insight paragraphs quote.
+
+The tables are a few hundred rows. ``python -m fee_impact.aggregates`` (and
+every ingest) writes them to ``data/aggregates/``, stamped with the version
+of the export they were computed from; a missing or stale table is
+recomputed in memory instead.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from millify import millify
+
+from fee_impact import store
+from fee_impact.cache import freeze
+from fee_impact.registry import PERIOD, dataset_version, get_dataset, load_dataset
+
+AGGREGATED = ("df1", "df2", "df3", "df5", "df9", "df11")
+AGGREGATES_DIR = "aggregates"
+ALL = "All"     # segment of the datasets without a partition key
+
+
+def aggregates_path(name):
+    ds = get_dataset(name)
+    return os.path.join(os.path.dirname(ds.path), AGGREGATES_DIR, f"{name}.arrow")
+
+
+def metrics(ds):
+    return [col for col in ds.columns if col not in ("DATE", "PERIOD", *ds.partition_keys)]
+
+
+def compute(ds, df):
+    """Long table of per-(segment, metric, period) aggregates of ``df``."""
+    values = metrics(ds)
+    segment = df[ds.partition_keys[0]].astype(str) if ds.partition_keys else pd.Series(ALL, df.index)
+    grouped = df.groupby([segment.rename("SEGMENT"), df["PERIOD"]], observed=True)[values]
+    stats = pd.concat({"SUM": grouped.sum(), "MEAN": grouped.mean(), "MEDIAN": grouped.median()},
+                      axis=1).astype("float64")
+    out = stats.stack(level=1, future_stack=True).rename_axis(["SEGMENT", "PERIOD", "METRIC"])
+    out = out.reset_index().join(grouped.size().rename("DAYS"), on=["SEGMENT", "PERIOD"])
+
+    out = out.sort_values(["SEGMENT", "METRIC", "PERIOD"], kind="stable").reset_index(drop=True)
+    by_series = out.groupby(["SEGMENT", "METRIC"], sort=False)["MEAN"]
+    out["DELTA_PCT"] = by_series.pct_change()
+    baseline = out["PERIOD"] == PERIOD.categories[0]
+    base = out["MEAN"].where(baseline).groupby([out["SEGMENT"], out["METRIC"]]).transform("first")
+    out["VS_NO_FEE_PCT"] = (out["MEAN"] / base - 1).where(~baseline)
+    return out
+
+
+def materialize(name):
+    """Compute the table for ``name`` from its export and store it."""
+    ds = get_dataset(name)
+    table = pa.Table.from_pandas(compute(ds, store.load(ds.path, ds.schema)), preserve_index=False)
+    return store.write_ipc(aggregates_path(name), table, store.source_stamp(ds.path, ds.schema))
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _period_table(name, version):
+    ds = get_dataset(name)
+    table = store.read_ipc(aggregates_path(name), store.source_stamp(ds.path, ds.schema))
+    if table is None:
+        return freeze(compute(ds, load_dataset(name)))
+    return freeze(table.to_pandas())
+
+
+def period_table(name):
+    """Return a shallow copy of the shared, read-only aggregate table of ``name``."""
+    return _period_table(name, dataset_version(name)).copy(deep=False)
+
+
+def period_stats(name, metric, segment=ALL):
+    table = period_table(name)
+    return table[(table["METRIC"] == metric) & (table["SEGMENT"] == segment)]
+
+
+def metric_cards(name, metric, title, segment=ALL):
+    """One card per fee period with the daily average of ``metric``."""
+    rows = period_stats(name, metric, segment)
+    for col, row in zip(st.columns(len(PERIOD.categories)), rows.itertuples()):
+        delta = None if pd.isna(row.DELTA_PCT) else f"{row.DELTA_PCT:+.1%}"
+        col.metric(f"{title} ({row.PERIOD})", millify(row.MEAN, precision=2), delta,
+                   help=f"Daily average over {row.DAYS} days; change from the previous fee period")
+
+
+def period_pivot(name, metric):
+    """Segments x periods table of daily averages and their changes."""
+    table = period_table(name)
+    table = table[table["METRIC"] == metric]
+    means = table.pivot(index="SEGMENT", columns="PERIOD", values="MEAN")
+    changes = table.pivot(index="SEGMENT", columns="PERIOD", values="DELTA_PCT")
+    changes = changes.drop(columns=PERIOD.categories[0], errors="ignore").add_prefix("% change to ")
+    return pd.concat([means, changes * 100], axis=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize the per-period aggregate tables.")
+    parser.add_argument("names", nargs="*", default=list(AGGREGATED))
+    for name in parser.parse_args().names:
+        print(f"{name} -> {materialize(name)}")
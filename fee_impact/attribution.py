@@ -0,0 +1,130 @@
+"""Difference-in-differences of Uniswap against the other DEXs around the 0.25% hike.
+
+df6, df7 and df8 hold every DEX's daily volume, active users and swaps from
+the 0.15% fee onwards, so the hike is the fee change with a control group.
+For each metric the outcome is the daily log gap between Uniswap and a
+control (one other DEX, or all of them pooled):
+
+    gap = log(1 + uniswap) - log(1 + control)
+
+Market-wide shocks inside the window, such as the Base memecoin wave or the
+Dencun upgrade, move both sides and cancel out; what is left is how Uniswap
+moved relative to the rest of the market.
+
+- ``did_table``: change in the mean gap from the ``window`` days before the
+  hike to the ``window`` days after, as a percent effect on Uniswap relative
+  to the control, with a block-bootstrap interval and p-value
+- ``event_study``: the same change week by week, including the weeks before
+  the hike as a check on parallel trends
+
+All series go through one bootstrap run, cached per data version.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from fee_impact.bootstrap import bootstrap
+from fee_impact.cache import freeze
+from fee_impact.figures import cached_figure
+from fee_impact.profiler import phase
+from fee_impact.registry import FEE_CHANGES, dataset_version, load_dataset
+from fee_impact.share import SOURCES
+
+TREATED = "uniswap"
+POOLED = "all other DEXs"
+EVENT = pd.Timestamp(FEE_CHANGES["0.25% fee"])
+
+WINDOW = 42         # days on each side of the hike
+BLOCK = 7           # bootstrap block length, days
+RESAMPLES = 2000
+COVERAGE = 0.9      # share of the window's days a control DEX must be active on
+
+
+def gaps(name, window=WINDOW):
+    """Days x controls frame of the log gap between Uniswap and each control."""
+    df = load_dataset(name)
+    span = pd.Timedelta(days=window)
+    df = df[(df["DATE"] >= EVENT - span) & (df["DATE"] < EVENT + span)]
+    wide = df.pivot_table(index="DATE", columns="DEX", values=SOURCES[name],
+                          aggfunc="sum", observed=True).fillna(0)
+    if TREATED not in wide:
+        # no Uniswap days in the window, so nothing to compare against
+        return pd.DataFrame(index=wide.index, columns=[POOLED], dtype="float64")
+    treated = np.log1p(wide.pop(TREATED))
+    controls = pd.concat([wide.sum(axis=1).rename(POOLED),
+                          wide.loc[:, (wide > 0).mean() >= COVERAGE]], axis=1)
+    return np.log1p(controls).rsub(treated, axis=0)
+
+
+def _estimate(window, n):
+    frame = pd.concat({name: gaps(name, window) for name in SOURCES}, axis=1, join="inner")
+    values = frame.to_numpy().T
+    days = (frame.index - EVENT).days.to_numpy()
+    pre, post = np.flatnonzero(days < 0), np.flatnonzero(days >= 0)
+    series = pd.DataFrame(list(frame.columns), columns=["DATASET", "CONTROL"])
+    series.insert(1, "METRIC", series["DATASET"].map(SOURCES))
+
+    if len(pre) and len(post):
+        weeks = np.arange(days.min() // 7, days.max() // 7 + 1)
+        posts = [post] + [np.flatnonzero(days // 7 == week) for week in weeks]
+        base = values[:, pre].mean(axis=1)
+        point = np.stack([values[:, p].mean(axis=1) - base for p in posts])
+        draws = bootstrap(values, pre, posts, BLOCK, n)
+        low, high = np.percentile(draws, [2.5, 97.5], axis=-1)
+        p_value = np.minimum(1, 2 * np.minimum((draws <= 0).mean(-1), (draws >= 0).mean(-1)))
+    else:
+        # the data does not cover both sides of the hike: nothing to compare
+        weeks = np.arange(0)
+        point = low = high = p_value = np.full((1, len(series)), np.nan)
+
+    def rows(i):
+        return series.assign(ESTIMATE=point[i], EFFECT=np.expm1(point[i]),
+                             LOW=np.expm1(low[i]), HIGH=np.expm1(high[i]), P_VALUE=p_value[i])
+
+    did = rows(0)
+    did.insert(3, "DAYS_BEFORE", len(pre))
+    did.insert(4, "DAYS_AFTER", len(post))
+    events = pd.concat([rows(i + 1).assign(WEEK=week) for i, week in enumerate(weeks)],
+                       ignore_index=True) if len(weeks) else rows(0).iloc[:0].assign(WEEK=weeks)
+    return did, events
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _attribution(versions, window, n):
+    with phase("stats", "attribution"):
+        return freeze(_estimate(window, n))
+
+
+def _run(window, n):
+    return _attribution(tuple(dataset_version(name) for name in SOURCES), window, n)
+
+
+def did_table(window=WINDOW, n=RESAMPLES):
+    """One row per (metric, control): the hike's effect on Uniswap relative to it."""
+    return _run(window, n)[0]
+
+
+def event_study(window=WINDOW, n=RESAMPLES, control=POOLED):
+    """Week-by-week effect relative to the pre-hike window, for one control."""
+    events = _run(window, n)[1]
+    return events[events["CONTROL"] == control].reset_index(drop=True)
+
+
+def event_figure(window=WINDOW, n=RESAMPLES):
+    """The shared event-study chart entry; draw it with ``plot()``."""
+    def build():
+        import plotly.express as px
+
+        df = event_study(window, n)
+        df = df.assign(PLUS=df["HIGH"] - df["EFFECT"], MINUS=df["EFFECT"] - df["LOW"])
+        fig = px.line(df, x="WEEK", y="EFFECT", color="METRIC", markers=True,
+                      error_y="PLUS", error_y_minus="MINUS",
+                      title=f"Uniswap vs {POOLED}: weekly effect around the 0.25% hike")
+        fig.add_hline(y=0, line_dash="dot")
+        fig.add_vline(x=-0.5, line_dash="dash")
+        fig.update_layout(xaxis_title="Weeks since the hike", yaxis_title="Effect",
+                          yaxis_tickformat=".0%", hovermode="x unified")
+        return fig
+
+    return cached_figure(("event_study", window, n), tuple(SOURCES), build)
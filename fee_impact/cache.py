@@ -0,0 +1,83 @@
+"""Process-wide dataset cache keyed on the version of the files in ``data/``.
+
+Pages used to call ``st.cache_data.clear()`` on every run so that a refreshed
+CSV would show up, which meant every rerun re-parsed every file. Instead each
+cached load is keyed on the file's version (``store.file_version``: the
+ingest manifest's counter or the content hash, which is only recomputed when
+the file's size or mtime changes), so a warm rerun costs one ``os.stat`` per
+dataset. When a file changes only its own entries are dropped; the other
+datasets stay cached.
+
+Frames are held with ``st.cache_resource``: one copy per process, shared by
+every session, rather than one unpickled copy per session. Callers get a
+shallow copy, so assigning or dropping a column (``df["X"] = 0``,
+``df.drop(columns=..., inplace=True)``) only changes their own frame, and
+copy-on-write copies the values before a write into them. ``freeze`` makes
+the shared arrays themselves read-only, so writing through a raw array
+(``df.to_numpy()[0] = x``) raises instead of changing every session's data.
+"""
+
+import threading
+
+import numpy as np
+import streamlit as st
+
+from fee_impact import store
+
+_lock = threading.Lock()
+_current = {}   # path -> (version, {(schema_token, columns): schema}) held in the cache
+
+
+def _buffers(values):
+    if isinstance(values, np.ndarray):
+        yield values
+    # extension arrays: datetimes, categorical codes, nullable integers
+    for attr in ("_ndarray", "_codes", "_data", "_mask"):
+        inner = getattr(values, attr, None)
+        if isinstance(inner, np.ndarray):
+            yield inner
+
+
+def freeze(obj):
+    """Make the arrays behind ``obj`` read-only and return it.
+
+    ``obj`` is a DataFrame, a numpy array, or a tuple of them, about to be
+    shared through a process-wide cache.
+    """
+    if isinstance(obj, tuple):
+        for item in obj:
+            freeze(item)
+    elif isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    else:
+        for block in obj._mgr.blocks:
+            for array in _buffers(block.values):
+                array.flags.writeable = False
+    return obj
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _load(path, version, schema_token, columns, _schema):
+    # the schema is keyed by its token; categorical dtypes do not hash
+    return freeze(store.load(path, _schema, columns))
+
+
+def load_csv(path, schema=None, columns=None):
+    """Load ``path`` through the shared cache, dropping stale entries on change.
+
+    The columnar copy under ``data/columnar/`` is used when it is up to date;
+    ``columns`` restricts the load to the columns a page actually reads.
+    Callers get a shallow copy of the cached, read-only frame.
+    """
+    version = store.file_version(path)
+    columns = None if columns is None else tuple(columns)
+    token = store.schema_token(schema)
+    with _lock:
+        held, loaded = _current.get(path, (None, {}))
+        if held != version:
+            _current[path] = (version, {})
+        _current[path][1][(token, columns)] = schema
+    if held is not None and held != version:
+        for (old_token, old_columns), old_schema in loaded.items():
+            _load.clear(path, held, old_token, old_columns, old_schema)
+    return _load(path, version, token, columns, schema).copy(deep=False)
@@ -0,0 +1,28 @@
+"""The per-chain charts of the Chain Reaction page.
+
+The page shows one chart per chain for the metric picked in its selectbox.
+They are declared here rather than in the page so that everything the page
+can show is known without running it, e.g. to warm the figure cache.
+"""
+
+from fee_impact.charts import Chart
+
+CHAINS = ["Arbitrum", "Avalanche", "Base", "BSC", "Ethereum", "Optimism", "Polygon"]
+
+# selectbox option -> (dataset, column, chart title)
+METRICS = {
+    "volume": ("df3", "VOLUME_USD", "{chain} Uniswap Daily Volume (USD)"),
+    "unique swappers": ("df3", "UNIQUE_SWAPPERS", "{chain} Uniswap Daily Unique Swappers"),
+    "new users": ("df5", "NEW_USERS", "{chain} Uniswap Daily New Users"),
+    "new pools": ("df11", "NEW_POOLS_CREATED", "Daily New Uniswap Pools Created On {chain}"),
+}
+
+
+def chain_chart(metric, chain):
+    name, column, title = METRICS[metric]
+    return Chart(name, segment=chain, y=column, title=title.format(chain=chain))
+
+
+def chain_charts(metric):
+    """One chart per chain for ``metric``, in page order."""
+    return [chain_chart(metric, chain) for chain in CHAINS]
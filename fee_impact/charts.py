@@ -0,0 +1,170 @@
+"""Charts declared as data and rendered by one engine.
+
+A page declares each chart as a ``Chart`` and lays them out with ``render``
+and ``render_grid``. Figures are only built for charts the layout actually
+renders, and equal specs share one cached figure, so this is the one place
+where caching and instrumentation hook into chart rendering.
+"""
+
+from dataclasses import dataclass, replace
+
+import streamlit as st
+
+from fee_impact import query, window
+from fee_impact.controls import view_options
+from fee_impact.figures import cached_figure
+from fee_impact.instrument import fit_budget, record
+from fee_impact.partitions import segment as load_segment
+from fee_impact.profiler import phase
+from fee_impact.registry import dataset_version, get_dataset, load_dataset, source_url
+from fee_impact.resample import bucket, downsample
+from fee_impact.share import subset_shares, top_n
+
+
+@dataclass(frozen=True)
+class Chart:
+    dataset: str
+    y: str
+    title: str
+    kind: str = "bar"
+    x: str = "DATE"
+    color: str = "PERIOD"
+    segment: object = None
+    resolution: str = "daily"
+    max_points: int = None
+    top_n: int = None
+    webgl: bool = False
+    universe: tuple = None      # DEXs a market share is recomputed within
+    dates: tuple = None         # DATE intervals shown, see fee_impact.window
+
+    @property
+    def url(self):
+        return source_url(self.dataset)
+
+    @property
+    def display_title(self):
+        title = self.title
+        if self.universe:
+            title = f"{title} among {', '.join(self.universe)}"
+        if self.resolution != "daily":
+            title = f"{title} ({self.resolution} average)"
+        return title
+
+    @property
+    def columns(self):
+        """The dataset columns the chart plots."""
+        return list(dict.fromkeys(col for col in (self.x, self.y, self.color) if col))
+
+    @property
+    def filters(self):
+        if self.segment is None:
+            return {}
+        return {get_dataset(self.dataset).partition_keys[0]: self.segment}
+
+    def data(self):
+        with phase("transform", self.title):
+            key = (self.dataset, dataset_version(self.dataset), self.segment, self.universe,
+                   tuple(self.columns))
+            if self.universe:
+                df = window.view(subset_shares(self.dataset, self.universe), self.dates, key)
+            elif query.enabled():
+                # the scan only reads the dates around the window; gaps are cut here
+                start, end = window.hull(self.dates)
+                df = query.select(self.dataset, self.columns, self.filters, start, end)
+                df = window.view(df, self.dates)
+            elif self.segment is None:
+                df = window.view(load_dataset(self.dataset, self.columns), self.dates, key)
+            else:
+                df = window.view(load_segment(self.dataset, self.segment, self.columns),
+                                 self.dates, key)
+            by = [self.color] if self.color else []
+            if self.top_n:
+                df = top_n(df, self.x, self.color, self.y, self.top_n)
+            df = bucket(df, self.x, self.y, by, self.resolution)
+            # thinning stacked bars would leave gaps, so only lines/areas are thinned
+            if self.max_points and self.kind != "bar":
+                df = downsample(df, self.x, self.y, by, self.max_points)
+            return df
+
+
+def build_figure(chart):
+    # plotly is imported by the first build, not by every page declaring charts
+    import plotly.express as px
+
+    if chart.kind == "area" and chart.webgl:
+        return build_area_gl(chart)
+    draw = getattr(px, chart.kind)
+    fig = draw(chart.data(),
+               x=chart.x,
+               y=chart.y,
+               color=chart.color,
+               title=chart.display_title)
+    fig.update_layout(hovermode="x unified")
+    if chart.max_points and chart.kind == "area":
+        # thinned traces no longer share every x; interpolate instead of
+        # stacking onto zeros
+        fig.update_traces(stackgaps="interpolate")
+    return fig
+
+
+def build_area_gl(chart):
+    """Stacked area drawn with WebGL traces.
+
+    WebGL scatter traces cannot stack, so the stack is computed here: each
+    trace is filled down to the running total of the traces below it, and
+    hover shows the trace's own value.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    wide = chart.data().pivot_table(index=chart.x, columns=chart.color, values=chart.y,
+                                    aggfunc="sum", observed=True, fill_value=0)
+    stacked = wide.cumsum(axis=1)
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, name in enumerate(wide.columns):
+        fig.add_trace(go.Scattergl(x=wide.index,
+                                   y=stacked[name],
+                                   customdata=wide[name],
+                                   name=str(name),
+                                   mode="lines",
+                                   line={"width": 0.5, "color": colors[i % len(colors)]},
+                                   fill="tozeroy" if i == 0 else "tonexty",
+                                   hovertemplate="%{customdata:.2f}"))
+    fig.update_layout(title=chart.display_title,
+                      hovermode="x unified",
+                      xaxis_title=chart.x,
+                      yaxis_title=chart.y,
+                      legend_title_text=chart.color)
+    return fig
+
+
+def figure_entry(chart):
+    def build():
+        with phase("build", chart.title):
+            return build_figure(chart)
+
+    return cached_figure(chart, [chart.dataset], build)
+
+
+def figure(chart):
+    """A copy of the shared figure for ``chart``, which the caller may modify."""
+    return figure_entry(chart).figure
+
+
+def render(chart):
+    requested = replace(chart, **view_options(chart))
+    rendered, entry = fit_budget(requested, figure_entry)
+    with phase("render", chart.title):
+        entry.plot()
+        st.link_button("View SQL", chart.url)
+    record(requested, rendered, entry.payload)
+
+
+def render_grid(rows):
+    """Render rows of charts two to a row; ``None`` leaves a cell empty."""
+    for row in rows:
+        for col, chart in zip(st.columns(2), row):
+            if chart is not None:
+                with col:
+                    render(chart)
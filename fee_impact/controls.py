@@ -0,0 +1,106 @@
+"""Sidebar controls shared by every page.
+
+Widget state is dropped when the user switches page, so each control mirrors
+its value into a plain session_state key that outlives the widget.
+"""
+
+import streamlit as st
+
+from fee_impact import profiler, window
+from fee_impact.instrument import start_page
+from fee_impact.registry import PERIODS
+from fee_impact.resample import RESOLUTIONS
+
+DEFAULTS = {
+    "resolution": "daily",
+    "downsample": False,
+    "top_n": 8,
+    "webgl": True,
+    "periods": list(PERIODS),
+    "date_range": None,     # the whole history
+}
+
+# points kept per trace when downsampling is switched on
+MAX_POINTS = 500
+
+
+def _keep(name):
+    st.session_state[name] = st.session_state[f"_{name}"]
+
+
+def _keep_range():
+    # the picker reports a single date while the end of a range is being chosen
+    picked = st.session_state["_date_range"]
+    if len(picked) == 2:
+        first, last = window.span()
+        full = (picked[0] <= first.date() and picked[1] >= last.date())
+        st.session_state["date_range"] = None if full else tuple(picked)
+
+
+def _value(name):
+    return st.session_state.get(name, DEFAULTS[name])
+
+
+def sidebar(page):
+    start_page(page)
+    profiler.start_run(page)
+    options = list(RESOLUTIONS)
+    with st.sidebar:
+        st.radio("Time resolution",
+                 options,
+                 index=options.index(_value("resolution")),
+                 key="_resolution",
+                 on_change=_keep,
+                 args=("resolution",),
+                 help="Weekly and monthly views show the average daily value of each bucket.")
+        st.checkbox("Downsample dense area charts",
+                    value=_value("downsample"),
+                    key="_downsample",
+                    on_change=_keep,
+                    args=("downsample",),
+                    help=f"Keep at most {MAX_POINTS} points per trace (LTTB).")
+        st.slider("DEXs shown in market-share charts",
+                  min_value=3,
+                  max_value=30,
+                  value=_value("top_n"),
+                  key="_top_n",
+                  on_change=_keep,
+                  args=("top_n",),
+                  help="Smaller DEXs are summed into 'others'. Uniswap is always shown.")
+        st.checkbox("WebGL market-share charts",
+                    value=_value("webgl"),
+                    key="_webgl",
+                    on_change=_keep,
+                    args=("webgl",))
+        st.multiselect("Fee periods",
+                       PERIODS,
+                       default=_value("periods"),
+                       key="_periods",
+                       on_change=_keep,
+                       args=("periods",),
+                       help="Charts over time only show the days of these periods.")
+        first, last = (day.date() for day in window.span())
+        st.date_input("Date range",
+                      value=_value("date_range") or (first, last),
+                      min_value=first,
+                      max_value=last,
+                      key="_date_range",
+                      on_change=_keep_range,
+                      help="Applies to every chart over time, on every page.")
+
+
+def view_options(chart):
+    """Fields of ``chart`` implied by the current sidebar state.
+
+    Top-N folding and WebGL only apply to charts that opt in with ``top_n``.
+    """
+    start, end = _value("date_range") or (None, None)
+    options = {
+        "resolution": _value("resolution"),
+        "max_points": MAX_POINTS if _value("downsample") else None,
+        "dates": window.intervals(start, end, _value("periods")),
+    }
+    if chart.top_n:
+        options["top_n"] = _value("top_n")
+        options["webgl"] = _value("webgl")
+    return options
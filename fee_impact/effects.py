@@ -0,0 +1,128 @@
+"""Before/after effect of each fee change on every metric and segment.
+
+The totals (df1, df4, df10) and the per-version, per-chain and per-user-class
+tables (df2, df3, df5, df9, df11) are stacked into one long frame of
+(dataset, segment, metric, date) values. Each fee change compares the
+``window`` days before it with the ``window`` days after it (or the whole
+neighbouring periods with ``window=None``) in a single groupby:
+
+- ``PCT_CHANGE``: change in the daily mean
+- ``ELASTICITY``: arc (midpoint) elasticity of the daily mean with respect
+  to the fee, which stays defined for the 0 -> 0.15% introduction
+- ``T`` / ``P_VALUE``: Welch's t-test on log daily values. Daily series are
+  autocorrelated, so the p-values are optimistic; use them to rank, not to
+  prove.
+
+The matrix is cached per data version and window.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from fee_impact.aggregates import ALL, metrics
+from fee_impact.cache import freeze
+from fee_impact.profiler import phase
+from fee_impact.registry import FEES, PERIODS, dataset_version, get_dataset, load_dataset
+
+DATASETS = ("df1", "df2", "df3", "df4", "df5", "df9", "df10", "df11")
+
+# each fee change, named by the period it starts
+CHANGES = PERIODS[1:]
+WINDOW = 30
+
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+
+def stacked(names=DATASETS):
+    """One row per (dataset, segment, metric, date) with its value."""
+    parts = []
+    for name in names:
+        ds = get_dataset(name)
+        df = load_dataset(name)
+        values = metrics(ds)
+        k = len(values)
+        segment = df[ds.partition_keys[0]].astype(str).to_numpy() if ds.partition_keys \
+            else np.full(len(df), ALL)
+        parts.append(pd.DataFrame({
+            "DATASET": name,
+            "SEGMENT": np.tile(segment, k),
+            "METRIC": np.repeat(values, len(df)),
+            "DATE": np.tile(df["DATE"].to_numpy(), k),
+            "PERIOD": np.tile(df["PERIOD"].cat.codes.to_numpy(), k),
+            "VALUE": np.concatenate([df[col].to_numpy(dtype="float64") for col in values]),
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+def t_pvalue(t, dof):
+    """Two-sided p-value of Student's t, via the Hill normal approximation."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = t * (1 - 1 / (4 * dof)) / np.sqrt(1 + t ** 2 / (2 * dof))
+    return _erfc(np.abs(z) / math.sqrt(2)).astype("float64")
+
+
+def compute(long, window=WINDOW):
+    """Effect of every fee change on every (dataset, segment, metric) series."""
+    parts = []
+    for after in CHANGES:
+        code = PERIODS.index(after)
+        side = long["PERIOD"].to_numpy() - (code - 1)       # 0 before, 1 after
+        keep = (side == 0) | (side == 1)
+        if window:
+            start = long.loc[side == 1, "DATE"].min()
+            span = pd.Timedelta(days=window)
+            keep &= ((long["DATE"] >= start - span) & (long["DATE"] < start + span)).to_numpy()
+        parts.append(long[keep].assign(CHANGE=after, SIDE=side[keep]))
+    rows = pd.concat(parts, ignore_index=True)
+    rows["LOG"] = np.log1p(rows["VALUE"].clip(lower=0))
+
+    key = ["DATASET", "SEGMENT", "METRIC", "CHANGE"]
+    stats = rows.groupby([*key, "SIDE"], sort=False).agg(
+        N=("LOG", "count"), MEAN=("VALUE", "mean"),
+        LOG_MEAN=("LOG", "mean"), LOG_VAR=("LOG", "var")).unstack("SIDE")
+    # a change the data covers on one side only gets NaN statistics, not a KeyError
+    stats = stats.reindex(columns=pd.MultiIndex.from_product(
+        [stats.columns.levels[0], [0, 1]], names=stats.columns.names))
+    n0, n1 = stats[("N", 0)], stats[("N", 1)]
+    m0, m1 = stats[("MEAN", 0)], stats[("MEAN", 1)]
+    v0, v1 = stats[("LOG_VAR", 0)] / n0, stats[("LOG_VAR", 1)] / n1
+
+    change = stats.index.get_level_values("CHANGE")
+    f1 = change.map(FEES).to_numpy()
+    f0 = change.map(lambda p: FEES[PERIODS[PERIODS.index(p) - 1]]).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se = np.sqrt(v0 + v1)
+        t = (stats[("LOG_MEAN", 1)] - stats[("LOG_MEAN", 0)]) / se
+        dof = (v0 + v1) ** 2 / (v0 ** 2 / (n0 - 1) + v1 ** 2 / (n1 - 1))
+        out = pd.DataFrame({
+            "N_BEFORE": n0, "N_AFTER": n1, "MEAN_BEFORE": m0, "MEAN_AFTER": m1,
+            "PCT_CHANGE": m1 / m0 - 1,
+            "ELASTICITY": ((m1 - m0) / ((m1 + m0) / 2)) / ((f1 - f0) / ((f1 + f0) / 2)),
+            "T": t,
+        })
+    out["P_VALUE"] = t_pvalue(t.to_numpy(), dof.to_numpy())
+    return out.reset_index()
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _impact(versions, window):
+    with phase("stats"):
+        return freeze(compute(stacked(), window))
+
+
+def impact_table(window=WINDOW):
+    """Return the shared, read-only effect matrix for the current data."""
+    return _impact(tuple(dataset_version(name) for name in DATASETS), window)
+
+
+def ranking(change, metric=None, window=WINDOW, alpha=0.05):
+    """Series ordered from the largest fall to the largest rise after ``change``."""
+    table = impact_table(window)
+    table = table[table["CHANGE"] == change]
+    if metric:
+        table = table[table["METRIC"] == metric]
+    table = table.assign(SIGNIFICANT=table["P_VALUE"] < alpha)
+    return table.sort_values("PCT_CHANGE", kind="stable").reset_index(drop=True)
@@ -0,0 +1,134 @@
+"""Process-wide cache of finished plotly figures.
+
+The data only changes when a file in ``data/`` does, so a chart is built once
+per dataset version and handed to every session. Entries are keyed on the
+chart's spec plus the versions of the datasets it reads, and the cache is a
+bounded LRU so old versions and rarely viewed charts age out.
+
+The cached figure object itself never leaves this module: ``plot`` draws it
+(Streamlit only reads it, through ``to_dict``) and ``figure`` hands out a
+copy, so a page that restyles a figure cannot change it for other sessions.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from fee_impact.instrument import measure
+from fee_impact.profiler import phase
+from fee_impact.registry import dataset_version
+
+FIGURE_CACHE_SIZE = int(os.environ.get("FEE_IMPACT_FIGURE_CACHE_SIZE", "256"))
+
+
+class LRUCache:
+    """Thread-safe LRU map that builds each missing value once.
+
+    Concurrent sessions asking for the same missing key wait for the first
+    one to build it instead of building it in parallel.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._items:
+                return self._hit(key)
+            key_lock = self._building.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._items:
+                    return self._hit(key)
+            try:
+                value = build()
+            except BaseException:
+                with self._lock:
+                    self._building.pop(key, None)
+                raise
+            # published and unmarked at once, so no thread finds the key in neither
+            with self._lock:
+                self.misses += 1
+                self._items[key] = value
+                self._building.pop(key, None)
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+            return value
+
+    def _hit(self, key):
+        self.hits += 1
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._items), "maxsize": self.maxsize,
+                    "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class CachedFigure:
+    """A finished figure plus its JSON and payload size, computed at most once."""
+
+    __slots__ = ("_figure", "_json", "_payload")
+
+    def __init__(self, figure):
+        self._figure = figure
+        self._json = None
+        self._payload = None
+
+    @property
+    def figure(self):
+        """A copy of the figure, which the caller may modify."""
+        import plotly.graph_objects as go
+
+        return go.Figure(self._figure)
+
+    def plot(self):
+        """Draw the shared figure in the current Streamlit container."""
+        st.plotly_chart(self._figure, theme="streamlit", use_container_width=True)
+
+    @property
+    def json(self):
+        if self._json is None:
+            import plotly.io as pio
+
+            with phase("serialize", self._figure.layout.title.text or ""):
+                self._json = pio.to_json(self._figure, validate=False)
+        return self._json
+
+    @property
+    def payload(self):
+        if self._payload is None:
+            self._payload = measure(self._figure, self.json)
+        return self._payload
+
+
+FIGURES = LRUCache(FIGURE_CACHE_SIZE)
+
+
+def cached_figure(spec, datasets, build):
+    """Return the shared entry for ``spec``, calling ``build()`` on a miss.
+
+    ``spec`` must be hashable and describe the figure completely; ``datasets``
+    names the datasets ``build`` reads, whose versions are part of the key.
+    Draw the entry with ``plot``; its ``figure`` is a private copy.
+    """
+    key = (spec, tuple(dataset_version(name) for name in datasets))
+    return FIGURES.get_or_build(key, lambda: CachedFigure(build()))
+
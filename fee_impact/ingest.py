@@ -0,0 +1,225 @@
+"""Append-only refresh of the ``data/`` exports from a new export drop.
+
+    python -m fee_impact.ingest DROP_DIR [df1 df3 ...]
+
+A drop is a directory of fresh exports named like the files in ``data/``.
+Instead of replacing each file, the drop's rows are deduplicated on their
+natural key (DATE plus the dataset's partition keys) and only the dates whose
+rows changed are written: the stored file is truncated at the first changed
+date and the merged tail is appended. Stored rows the drop no longer contains
+are kept.
+
+``data/manifest.json`` records, per file, a hash and byte offset for every
+date plus a version counter. Finding the changed dates needs only the drop
+and the manifest, the write touches only the tail of the CSV (the columnar
+copy, if current, is rewritten whole from its old rows and the tail), and the
+version bump is what the dataset, partition and figure caches key on, so
+only the refreshed datasets are reloaded and rebuilt (and their per-period
+aggregate tables re-materialized). A file edited by hand is re-indexed, and
+its version bumped, on the next ingest.
+"""
+
+import argparse
+import bisect
+import io
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from fee_impact import aggregates, store
+from fee_impact.registry import DATASETS, get_dataset
+
+# how dates are written back; sorts the same as chronological order
+DATE_TEXT = "%Y-%m-%d %H:%M:%S.000"
+
+
+@dataclass(frozen=True)
+class Refresh:
+    name: str
+    version: int
+    dates: int          # dates added or changed
+    rows: int           # rows rewritten at the end of the file
+    bytes: int
+    reindexed: bool     # the file had changed outside the ingest
+
+
+def natural_key(ds):
+    return ["DATE", *ds.partition_keys]
+
+
+def _stat(path):
+    info = os.stat(path)
+    return [info.st_size, info.st_mtime_ns]
+
+
+def _line_starts(data):
+    return np.concatenate([[0], np.flatnonzero(np.frombuffer(data, np.uint8) == 10) + 1])
+
+
+def _rows(data):
+    """Parse CSV bytes as text, normalizing DATE and dropping the trailing junk.
+
+    Returns the rows and how many leading lines they came from.
+    """
+    df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, skip_blank_lines=False)
+    dates = pd.to_datetime(df["DATE"], format=store.DATE_FORMAT, errors="coerce")
+    valid = int(dates.notna().sum())
+    if not dates.iloc[:valid].notna().all():
+        raise ValueError("rows without a DATE before the end of the export")
+    df = df.iloc[:valid].copy()
+    df["DATE"] = dates.iloc[:valid].dt.strftime(DATE_TEXT)
+    return df, valid
+
+
+def _date_hashes(rows):
+    """Order-independent hash of each date's rows, keyed by DATE text."""
+    # shifted so that summing up to 65536 rows per date cannot wrap around
+    hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy() >> np.uint64(16)
+    sums = pd.Series(hashes).groupby(rows["DATE"].to_numpy(), sort=True).sum()
+    return {date: format(int(value), "016x") for date, value in sums.items()}
+
+
+def _date_offsets(rows, starts, base=0):
+    """Byte offset of the first row of each date, given each row's line start."""
+    dates = rows["DATE"].to_numpy()
+    first = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if len(dates) else []
+    return [str(d) for d in dates[first]], [base + int(starts[i]) for i in first]
+
+
+def index_file(path, version):
+    """Build the manifest entry of a stored file from scratch."""
+    with open(path, "rb") as f:
+        data = f.read()
+    header = data[:data.index(b"\n") + 1]
+    rows, valid = _rows(data)
+    if not rows["DATE"].is_monotonic_increasing:
+        raise ValueError(f"{path} is not sorted by DATE")
+    starts = _line_starts(data)[1:]         # skip the header line
+    lines = len(starts) - (starts[-1] == len(data))
+    if lines < valid:
+        raise ValueError(f"{path} has rows spanning several lines")
+    dates, offsets = _date_offsets(rows, starts)
+    hashes = _date_hashes(rows)
+    return {
+        "version": version,
+        "stat": _stat(path),
+        "columns": list(rows.columns),
+        "newline": "\r\n" if header.endswith(b"\r\n") else "\n",
+        "dates": dates,
+        "hashes": [hashes[d] for d in dates],
+        "offsets": offsets,
+        "end": int(starts[valid]) if valid < len(starts) else len(data),
+    }
+
+
+def _save_manifest(folder, name, entry):
+    manifest = {**store.read_manifest(folder), name: entry}
+    path = os.path.join(folder, store.MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+def _current_columnar(path, schema):
+    cpath = store.columnar_path(path)
+    if not os.path.exists(cpath):
+        return False
+    meta = pa.ipc.open_file(pa.memory_map(cpath, "r")).schema.metadata or {}
+    return meta.get(store.SOURCE_KEY) == store.source_stamp(path, schema)
+
+
+def _update_columnar(path, schema, since, tail):
+    """Replace the columnar copy's rows from ``since`` on with ``tail``.
+
+    An IPC file ends with its footer, so this rewrites the whole copy: the
+    cost grows with the total number of rows, not with the refreshed ones,
+    but the stored rows are copied from the memory map instead of re-parsed
+    from the CSV.
+    """
+    with pa.memory_map(store.columnar_path(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        cut = int(np.searchsorted(table["DATE"].to_numpy(), np.datetime64(since)))
+        fresh = pa.Table.from_pandas(tail, preserve_index=False).cast(table.schema)
+        merged = pa.concat_tables([table.slice(0, cut), fresh]).combine_chunks()
+        store.write_columnar(path, merged.unify_dictionaries(), schema)
+
+
+def ingest(name, drop_dir):
+    """Merge ``drop_dir``'s export of dataset ``name`` into ``data/``."""
+    ds = get_dataset(name)
+    folder, file = os.path.split(ds.path)
+    entry = store.read_manifest(folder).get(file)
+    reindexed = entry is None or entry["stat"] != _stat(ds.path)
+    if reindexed:
+        entry = index_file(ds.path, entry["version"] + 1 if entry else 1)
+
+    with open(os.path.join(drop_dir, file), "rb") as f:
+        drop, _ = _rows(f.read())
+    if set(drop.columns) != set(entry["columns"]):
+        raise ValueError(f"{file}: drop has columns {list(drop.columns)}, "
+                         f"expected {entry['columns']}")
+    key = natural_key(ds)
+    drop = drop[entry["columns"]].drop_duplicates(key, keep="last")
+
+    known = dict(zip(entry["dates"], entry["hashes"]))
+    changed = [d for d, h in _date_hashes(drop).items() if known.get(d) != h]
+    if not changed:
+        if reindexed:
+            _save_manifest(folder, file, entry)
+        return Refresh(name, entry["version"], 0, 0, 0, reindexed)
+
+    # stored rows from the first changed date on, merged with the drop's
+    since = min(changed)
+    pos = bisect.bisect_left(entry["dates"], since)
+    offset = entry["offsets"][pos] if pos < len(entry["dates"]) else entry["end"]
+    newline = entry["newline"]
+    header = (",".join(entry["columns"]) + newline).encode()
+    with open(ds.path, "rb") as f:
+        f.seek(offset)
+        stored, _ = _rows(header + f.read(entry["end"] - offset))
+    tail = pd.concat([stored, drop[drop["DATE"] >= since]]).drop_duplicates(key, keep="last")
+    tail = tail.sort_values("DATE", kind="stable")
+    data = tail.to_csv(index=False, header=False, lineterminator=newline).encode()
+    # parse the tail the way the app will before touching the stored file
+    typed = store.read_source_csv(io.BytesIO(header + data), ds.schema)
+
+    columnar = _current_columnar(ds.path, ds.schema)
+    with open(ds.path, "r+b") as f:
+        f.seek(offset)
+        f.truncate()
+        f.write(data)
+
+    dates, offsets = _date_offsets(tail, _line_starts(data), base=offset)
+    hashes = _date_hashes(tail)
+    entry = {**entry,
+             "version": entry["version"] + 1,
+             "stat": _stat(ds.path),
+             "dates": entry["dates"][:pos] + dates,
+             "hashes": entry["hashes"][:pos] + [hashes[d] for d in dates],
+             "offsets": entry["offsets"][:pos] + offsets,
+             "end": offset + len(data)}
+    _save_manifest(folder, file, entry)
+    if columnar:
+        _update_columnar(ds.path, ds.schema, since, typed)
+    if name in aggregates.AGGREGATED:
+        aggregates.materialize(name)
+    return Refresh(name, entry["version"], len(changed), len(tail), len(data), reindexed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge a new export drop into data/.")
+    parser.add_argument("drop", help="directory holding the new dfN.csv exports")
+    parser.add_argument("names", nargs="*")
+    args = parser.parse_args()
+
+    names = args.names or [name for name, ds in DATASETS.items()
+                           if os.path.exists(os.path.join(args.drop, os.path.basename(ds.path)))]
+    for name in names:
+        r = ingest(name, args.drop)
+        note = " (re-indexed)" if r.reindexed else ""
+        print(f"{name}: {r.dates} dates changed, {r.rows} rows written "
+              f"({r.bytes / 1024:.1f} KB), now v{r.version}{note}")
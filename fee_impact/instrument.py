@@ -0,0 +1,124 @@
+"""Payload size accounting for every chart a page sends to the browser.
+
+``charts.render`` records the serialized size, trace count and point count of
+each figure it draws. The numbers are logged as one JSON line per chart on
+the ``fee_impact.payload`` logger and, with ``?debug=1`` in the URL or
+``FEE_IMPACT_DEBUG=1``, shown in a sidebar panel.
+
+A chart larger than ``FEE_IMPACT_CHART_BUDGET_KB``, or one that would take the
+page past ``FEE_IMPACT_PAGE_BUDGET_KB``, is either only reported
+(``FEE_IMPACT_BUDGET_ACTION=warn``) or re-rendered at a coarser level of
+detail until it fits (``downsample``, the default).
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, replace
+
+import pandas as pd
+import streamlit as st
+
+log = logging.getLogger("fee_impact.payload")
+
+CHART_BUDGET = int(os.environ.get("FEE_IMPACT_CHART_BUDGET_KB", "512")) * 1024
+PAGE_BUDGET = int(os.environ.get("FEE_IMPACT_PAGE_BUDGET_KB", "2048")) * 1024
+BUDGET_ACTION = os.environ.get("FEE_IMPACT_BUDGET_ACTION", "downsample")
+
+# points per trace when a chart is downsampled to meet its budget
+BUDGET_MAX_POINTS = 250
+
+_RUN_KEY = "_payload_run"
+
+
+@dataclass(frozen=True)
+class Payload:
+    bytes: int
+    traces: int
+    points: int
+
+
+def measure(figure, serialized):
+    points = sum(len(trace.x) if trace.x is not None else 0 for trace in figure.data)
+    return Payload(bytes=len(serialized.encode()), traces=len(figure.data), points=points)
+
+
+def start_page(page):
+    """Reset the per-run records; called once at the top of every page run."""
+    st.session_state[_RUN_KEY] = {"page": page, "charts": []}
+
+
+def _run():
+    return st.session_state.setdefault(_RUN_KEY, {"page": "?", "charts": []})
+
+
+def page_bytes():
+    return sum(row["bytes"] for row in _run()["charts"])
+
+
+def coarser(chart):
+    """The next cheaper variant of ``chart``, or None when none is left."""
+    if chart.kind != "bar" and not chart.max_points:
+        return replace(chart, max_points=BUDGET_MAX_POINTS)
+    if chart.resolution == "daily":
+        return replace(chart, resolution="weekly")
+    if chart.resolution == "weekly":
+        return replace(chart, resolution="monthly")
+    return None
+
+
+def fit_budget(chart, entry_for):
+    """Return ``(chart, entry)`` for the most detailed variant within budget.
+
+    ``entry_for`` maps a chart to its cached figure entry. With the "warn"
+    action the requested chart is always kept.
+    """
+    entry = entry_for(chart)
+    while _over_budget(entry.payload) and BUDGET_ACTION == "downsample":
+        cheaper = coarser(chart)
+        if cheaper is None:
+            break
+        chart, entry = cheaper, entry_for(cheaper)
+    return chart, entry
+
+
+def _over_budget(payload):
+    return payload.bytes > CHART_BUDGET or page_bytes() + payload.bytes > PAGE_BUDGET
+
+
+def record(requested, rendered, payload):
+    run = _run()
+    row = {"page": run["page"], "chart": requested.title, **asdict(payload),
+           "resolution": rendered.resolution, "max_points": rendered.max_points,
+           "degraded": rendered != requested}
+    run["charts"].append(row)
+    log.info(json.dumps(row))
+    if payload.bytes > CHART_BUDGET:
+        log.warning("chart %r is %d KB, over the %d KB budget",
+                    requested.title, payload.bytes // 1024, CHART_BUDGET // 1024)
+    total = page_bytes()
+    if total > PAGE_BUDGET and total - payload.bytes <= PAGE_BUDGET:
+        log.warning("page %r passed its %d KB budget", run["page"], PAGE_BUDGET // 1024)
+
+
+def debug_enabled():
+    return os.environ.get("FEE_IMPACT_DEBUG") == "1" or st.query_params.get("debug") == "1"
+
+
+def debug_panel():
+    """Sidebar table of this run's chart payloads; call at the end of a page."""
+    if not debug_enabled():
+        return
+    charts = _run()["charts"]
+    with st.sidebar.expander("Chart payloads", expanded=True):
+        if not charts:
+            st.caption("No charts on this page.")
+            return
+        df = pd.DataFrame(charts).drop(columns="page")
+        df["kb"] = (df.pop("bytes") / 1024).round(1)
+        st.dataframe(df, hide_index=True)
+        total = page_bytes()
+        st.caption(f"{len(charts)} charts, {total / 1024:.0f} KB "
+                   f"(budgets: {CHART_BUDGET // 1024} KB/chart, {PAGE_BUDGET // 1024} KB/page)")
+        if total > PAGE_BUDGET:
+            st.warning("This page is over its payload budget.")
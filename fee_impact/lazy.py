@@ -0,0 +1,21 @@
+"""Stand-ins for heavy page dependencies that import them on first use.
+
+Whatever a page imports at the top is paid for before it shows anything, on
+every cold start. ``streamlit_extras.colored_header`` alone takes ~70 ms to
+import (its registration decorator inspects the whole call stack), so pages
+take it from here and it is only imported when the first header is drawn.
+"""
+
+import importlib
+
+
+def deferred(module, name):
+    """A callable that imports ``module`` and calls its ``name``, on first use."""
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    return call
+
+
+colored_header = deferred("streamlit_extras.colored_header", "colored_header")
@@ -0,0 +1,63 @@
+"""Per-segment index over the datasets declared with ``partition_keys``.
+
+Charts that show one chain, version or user category used to filter the whole
+frame with a boolean mask each time (``df3[df3['CHAIN'] == 'Arbitrum']``).
+Instead each dataset is sorted by its partition keys once per version and the
+row range of every segment is recorded, so a lookup is a dict hit plus an
+``iloc`` slice whatever the size of the table. An index over only some
+columns (a chart's) is built from a load of just those columns.
+"""
+
+from dataclasses import dataclass, replace
+
+import streamlit as st
+
+from fee_impact.cache import freeze
+from fee_impact.registry import dataset_version, get_dataset, load_dataset
+
+
+@dataclass(frozen=True)
+class PartitionIndex:
+    frame: object
+    bounds: dict
+
+    def get(self, key):
+        bounds = self.bounds.get(key)
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[bounds[0]:bounds[1]]
+
+    def keys(self):
+        return list(self.bounds)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build(name, version, columns):
+    keys = list(get_dataset(name).partition_keys)
+    if not keys:
+        raise ValueError(f"dataset {name!r} declares no partition keys")
+    if columns is not None:
+        columns = ["DATE", *keys, *columns]
+    ordered = (load_dataset(name, columns)
+               .sort_values([*keys, "DATE"], kind="stable")
+               .reset_index(drop=True))
+    groups = ordered.groupby(keys if len(keys) > 1 else keys[0], observed=True, sort=False).indices
+    bounds = {key: (int(rows[0]), int(rows[-1]) + 1) for key, rows in groups.items()}
+    return PartitionIndex(freeze(ordered), bounds)
+
+
+def partition_index(name, columns=None):
+    """The index of ``name``, over ``columns`` plus DATE and the keys (default: all).
+
+    Its ``frame`` is a shallow copy of the shared one, like ``load_dataset``'s.
+    """
+    index = _build(name, dataset_version(name), None if columns is None else tuple(columns))
+    return replace(index, frame=index.frame.copy(deep=False))
+
+
+def segment(name, key, columns=None):
+    """Rows of dataset ``name`` whose partition key equals ``key``, in date order.
+
+    ``key`` is a tuple when the dataset is partitioned on more than one column.
+    """
+    return partition_index(name, columns).get(key)
@@ -0,0 +1,122 @@
+"""Opt-in wall/CPU timing of the phases behind every page run.
+
+Enable with ``FEE_IMPACT_PROFILE=1`` or ``?profile=1``. The data layer and the
+chart engine wrap their work in ``phase(...)``:
+
+- ``load``: fetching a dataset from the cache or disk
+- ``query``: a filtered read through ``fee_impact.query``
+- ``transform``: segment lookup, bucketing, top-N folding, downsampling
+- ``build``: constructing a plotly figure (only on a figure-cache miss)
+- ``serialize``: encoding a figure to JSON for payload accounting
+- ``render``: ``st.plotly_chart`` and the SQL link, including Streamlit's
+  own serialization of the figure
+- ``stats``: the fee-impact statistics and the bootstrap behind them (only
+  on a cache miss)
+
+Phases nest (a build loads its data), so each one is charged its self time
+only and the phases of a run add up to its total. Timings are aggregated per
+(page, phase, chart) for the life of the process, shown in a sidebar panel
+and exportable as CSV or JSON.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+_lock = threading.Lock()
+_stats = {}     # (page, phase, label) -> [count, wall, cpu, max_wall]
+_local = threading.local()
+
+
+def enabled():
+    if os.environ.get("FEE_IMPACT_PROFILE") == "1":
+        return True
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:
+        # no script run context, e.g. a background warm-up thread
+        return False
+
+
+@contextmanager
+def phase(name, label=""):
+    if not getattr(_local, "on", None):
+        yield
+        return
+    stack = _local.stack
+    frame = [0.0, 0.0]  # wall and cpu spent in nested phases
+    stack.append(frame)
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall0
+        cpu = time.thread_time() - cpu0
+        stack.pop()
+        if stack:
+            stack[-1][0] += wall
+            stack[-1][1] += cpu
+        _add((getattr(_local, "page", "?"), name, label), wall - frame[0], cpu - frame[1])
+
+
+def start_run(page):
+    """Turn profiling on or off for the current thread's page run."""
+    _local.on = enabled()
+    _local.stack = []
+    _local.page = page
+
+
+def _add(key, wall, cpu):
+    with _lock:
+        row = _stats.setdefault(key, [0, 0.0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += wall
+        row[2] += cpu
+        row[3] = max(row[3], wall)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def to_frame():
+    with _lock:
+        rows = [{"page": page, "phase": name, "chart": label, "calls": count,
+                 "wall_ms": wall * 1e3, "cpu_ms": cpu * 1e3,
+                 "mean_wall_ms": wall * 1e3 / count, "max_wall_ms": max_wall * 1e3}
+                for (page, name, label), (count, wall, cpu, max_wall) in _stats.items()]
+    columns = ["page", "phase", "chart", "calls", "wall_ms", "cpu_ms", "mean_wall_ms", "max_wall_ms"]
+    return pd.DataFrame(rows, columns=columns).round(3)
+
+
+def export(path):
+    """Write the aggregated timings to ``path`` as CSV or JSON (by extension)."""
+    df = to_frame()
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(df.to_dict(orient="records"), f, indent=2)
+    else:
+        df.to_csv(path, index=False)
+
+
+def profile_panel():
+    """Sidebar summary of the timings for this page; call at the end of a page."""
+    if not getattr(_local, "on", None):
+        return
+    df = to_frame()
+    df = df[df["page"] == getattr(_local, "page", "?")]
+    with st.sidebar.expander("Phase timings", expanded=True):
+        by_phase = df.groupby("phase")[["calls", "wall_ms", "cpu_ms"]].sum().round(1)
+        st.dataframe(by_phase)
+        st.dataframe(df.drop(columns="page").sort_values("wall_ms", ascending=False).head(20),
+                     hide_index=True)
+        full = to_frame()
+        st.download_button("Export CSV", full.to_csv(index=False), "profile.csv", "text/csv")
+        st.download_button("Export JSON", full.to_json(orient="records"), "profile.json",
+                           "application/json")
@@ -0,0 +1,170 @@
+"""Filtered reads of the datasets through an embedded DuckDB.
+
+``select`` turns a page's filters (a chain, DEX or user category, fee
+periods, a date range) into one parameterized SQL query over the dataset's
+file, so only the matching rows of the requested columns are materialized
+instead of the whole frame. The scan runs over the memory-mapped Arrow copy
+when it is current (see ``fee_impact.store``) and over the CSV otherwise.
+
+One in-process DuckDB database is shared by every session and thread; each
+query gets its own cursor, and DuckDB spreads a scan over
+``FEE_IMPACT_DUCKDB_THREADS`` threads (default: one per CPU).
+
+DuckDB is optional (``pip install duckdb``) and only used with
+``FEE_IMPACT_QUERY_BACKEND=duckdb``. Otherwise, or when it is not installed,
+the same filters are applied in pandas to the cached frame.
+"""
+
+import functools
+import importlib.util
+import logging
+import os
+import threading
+
+import pandas as pd
+
+from fee_impact import store
+from fee_impact.profiler import phase
+from fee_impact.registry import DATE, DIM, dataset_version, get_dataset, load_dataset
+
+BACKEND = os.environ.get("FEE_IMPACT_QUERY_BACKEND", "pandas")
+THREADS = int(os.environ.get("FEE_IMPACT_DUCKDB_THREADS", "0")) or os.cpu_count() or 1
+
+# registry dtypes -> the DuckDB types a CSV scan reads them as; DATE is read
+# as text and parsed after the scan, see _source
+SQL_TYPES = {DATE: "VARCHAR", "int32": "INTEGER", "float32": "FLOAT", "float64": "DOUBLE"}
+SQL_DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%g"
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_db = None
+_tables = {}    # name -> (version, memory-mapped Arrow table or None)
+
+
+@functools.cache
+def _installed():
+    # found, not imported: duckdb is only imported by the first query
+    if importlib.util.find_spec("duckdb") is None:
+        log.warning("FEE_IMPACT_QUERY_BACKEND=duckdb but duckdb is not installed; "
+                    "filtering in pandas")
+        return False
+    return True
+
+
+def enabled():
+    """Whether ``select`` runs in DuckDB."""
+    return BACKEND == "duckdb" and _installed()
+
+
+def connection():
+    """The process-wide DuckDB database; query it through ``connection().cursor()``."""
+    global _db
+    with _lock:
+        if _db is None:
+            import duckdb
+
+            _db = duckdb.connect(config={"threads": THREADS})
+        return _db
+
+
+def _columnar(name, version):
+    with _lock:
+        held = _tables.get(name)
+    if held is None or held[0] != version:
+        ds = get_dataset(name)
+        table = store.read_ipc(store.columnar_path(ds.path), store.source_stamp(ds.path, ds.schema))
+        with _lock:
+            _tables[name] = held = (version, table)
+    return held[1]
+
+
+def _source(cursor, name):
+    """Register or describe the relation ``name`` is scanned from."""
+    ds = get_dataset(name)
+    table = _columnar(name, dataset_version(name))
+    if table is not None:
+        cursor.register("source", table)
+        return "source"
+    # the junk last line of the exports (a stray BOM or empty fields) gets a
+    # NULL DATE, which select() drops as the pandas loader does; "null" is a
+    # missing value, as in pandas, not a reason to skip the row
+    types = ", ".join(f"'{col}': '{SQL_TYPES.get(str(dtype), 'VARCHAR')}'"
+                      for col, dtype in ds.schema.items())
+    path = ds.path.replace("'", "''")
+    return (f"(SELECT * REPLACE (try_strptime(\"DATE\", '{SQL_DATE_FORMAT}') AS \"DATE\") "
+            f"FROM read_csv('{path}', header = true, types = {{{types}}}, "
+            f"nullstr = ['null', ''], null_padding = true))")
+
+
+def _values(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def _names(columns):
+    return ", ".join(f'"{col}"' for col in columns)
+
+
+def _check(ds, columns):
+    unknown = [col for col in columns if col not in ds.schema]
+    if unknown:
+        raise KeyError(f"dataset {ds.name!r} has no columns {unknown}")
+
+
+def select(name, columns=None, where=None, start=None, end=None):
+    """Rows of ``name`` matching the filters, with only ``columns``.
+
+    ``where`` maps a column to the value, or list of values, it must hold
+    (``{"CHAIN": "Arbitrum", "PERIOD": ["no fee", "0.15% fee"]}``); ``start``
+    and ``end`` bound DATE, ``end`` excluded. Rows come back in date order
+    with the registry's dtypes, as a new frame the caller may modify.
+    """
+    ds = get_dataset(name)
+    columns = list(columns or ds.columns)
+    where = {col: _values(value) for col, value in (where or {}).items()}
+    _check(ds, [*columns, *where])
+    if not enabled():
+        return _select_pandas(name, columns, where, start, end)
+
+    clauses, params = ['"DATE" IS NOT NULL'], []
+    for col, values in where.items():
+        clauses.append(f'"{col}" IN ({", ".join("?" * len(values))})' if values else "false")
+        params += [str(value) for value in values]
+    if start is not None:
+        clauses.append('"DATE" >= ?')
+        params.append(pd.Timestamp(start).to_pydatetime())
+    if end is not None:
+        clauses.append('"DATE" < ?')
+        params.append(pd.Timestamp(end).to_pydatetime())
+    order = ["DATE", *(key for key in ds.partition_keys if key in columns)]
+
+    with phase("query", name):
+        cursor = connection().cursor()
+        try:
+            sql = (f"SELECT {_names(columns)} FROM {_source(cursor, name)} "
+                   f"WHERE {' AND '.join(clauses)} ORDER BY {_names(order)}")
+            df = cursor.execute(sql, params).df()
+        finally:
+            cursor.close()
+        return df.astype(store.column_dtypes(df, ds.schema))
+
+
+def _select_pandas(name, columns, where, start, end):
+    with phase("query", name):
+        df = load_dataset(name)
+        keep = pd.Series(True, index=df.index)
+        for col, values in where.items():
+            keep &= df[col].isin(values)
+        if start is not None:
+            keep &= df["DATE"] >= pd.Timestamp(start)
+        if end is not None:
+            keep &= df["DATE"] < pd.Timestamp(end)
+        df = df.loc[keep, columns].reset_index(drop=True)
+        # as from DuckDB, dimensions only keep the values that were selected
+        # and counts are only nullable when the selected rows miss one
+        schema = get_dataset(name).schema
+        dims = [col for col in columns if isinstance(schema[col], str) and schema[col] == DIM]
+        df = df.assign(**{col: df[col].cat.remove_unused_categories() for col in dims})
+        return df.astype(store.column_dtypes(df, schema))
@@ -0,0 +1,193 @@
+"""Every dataset the pages read, declared once.
+
+Pages ask for a dataset by name (``load_dataset("df3")``) instead of defining
+their own ``load_dfN`` functions, so each file is cached once per process no
+matter how many pages or sessions read it, and nothing is loaded until a page
+actually renders it.
+"""
+
+import os
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from fee_impact import store
+from fee_impact.cache import load_csv
+from fee_impact.profiler import phase
+
+# FEE_IMPACT_DATA_DIR points the app at another copy of the exports, e.g. a
+# synthetic one written by ``python -m fee_impact.synthetic``.
+DATA_DIR = os.environ.get("FEE_IMPACT_DATA_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+###################################
+############# DTYPES ##############
+###################################
+
+# Dimensions repeat on every row, so they load as categoricals. Counts fit
+# comfortably in int32 and shares/ratios only need float32; USD volumes stay
+# float64 because float32 cannot hold a billion-dollar day to the cent.
+PERIODS = ("no fee", "0.15% fee", "0.25% fee")
+PERIOD = pd.CategoricalDtype(PERIODS, ordered=True)
+FEES = {"no fee": 0.0, "0.15% fee": 0.15, "0.25% fee": 0.25}    # frontend fee, in %
+FEE_CHANGES = {"0.15% fee": "2023-10-17", "0.25% fee": "2024-04-15"}  # first day of each fee
+DATE = "datetime64[ns]"
+DIM = "category"
+COUNT = "int32"
+RATIO = "float32"
+USD = "float64"
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    title: str
+    url: str
+    schema: dict
+    partition_keys: tuple = ()
+    file: str = field(default="")
+
+    @property
+    def path(self):
+        return os.path.join(DATA_DIR, self.file or f"{self.name}.csv")
+
+    @property
+    def columns(self):
+        return tuple(self.schema)
+
+
+DATASETS = {ds.name: ds for ds in [
+    Dataset(
+        name="df1",
+        title="Uniswap daily activity",
+        url="https://flipsidecrypto.xyz/edit/queries/5ef84c36-29a4-4993-a322-7c22d7248272",
+        schema={"DATE": DATE, "PERIOD": PERIOD, "VOLUME_USD": USD,
+                "SWAPS": COUNT, "UNIQUE_SWAPPERS": COUNT, "ACTIVE_POOLS": COUNT},
+    ),
+    Dataset(
+        name="df2",
+        title="Uniswap daily activity by version",
+        url="https://flipsidecrypto.xyz/edit/queries/4ec52f72-2f3e-4c4d-ab4c-4438065d68fc",
+        schema={"DATE": DATE, "PLATFORM": DIM, "PERIOD": PERIOD, "VOLUME_USD": USD,
+                "SWAPS": COUNT, "UNIQUE_SWAPPERS": COUNT, "ACTIVE_POOLS": COUNT},
+        partition_keys=("PLATFORM",),
+    ),
+    Dataset(
+        name="df3",
+        title="Uniswap daily activity by chain",
+        url="https://flipsidecrypto.xyz/edit/queries/b71bb0ac-16a4-4595-bb34-80bd4699855a",
+        schema={"DATE": DATE, "CHAIN": DIM, "PERIOD": PERIOD, "VOLUME_USD": USD,
+                "SWAPS": COUNT, "UNIQUE_SWAPPERS": COUNT, "ACTIVE_POOLS": COUNT},
+        partition_keys=("CHAIN",),
+    ),
+    Dataset(
+        name="df4",
+        title="Uniswap daily new users",
+        url="https://flipsidecrypto.xyz/edit/queries/73f03b19-9e76-41e9-9095-61abf5dfc55f",
+        schema={"DATE": DATE, "PERIOD": PERIOD, "NEW_USERS": COUNT},
+    ),
+    Dataset(
+        name="df5",
+        title="Uniswap daily new users by chain",
+        url="https://flipsidecrypto.xyz/edit/queries/e39631a2-2ba1-4add-bf8d-b7f9d74fa538",
+        schema={"DATE": DATE, "CHAIN": DIM, "PERIOD": PERIOD, "NEW_USERS": COUNT},
+        partition_keys=("CHAIN",),
+    ),
+    Dataset(
+        name="df6",
+        title="DEX market share by volume",
+        url="https://flipsidecrypto.xyz/edit/queries/3e0f08b7-f532-41aa-9f85-616264f5172a",
+        schema={"DATE": DATE, "DEX": DIM, "VOLUME_USD": USD, "PCT_SHARE": RATIO},
+        partition_keys=("DEX",),
+    ),
+    Dataset(
+        name="df7",
+        title="DEX market share by active users",
+        url="https://flipsidecrypto.xyz/edit/queries/2e70e580-47a4-452e-9086-e6e60b39ffa2",
+        schema={"DATE": DATE, "DEX": DIM, "ACTIVE_USERS": COUNT, "PCT_SHARE": RATIO},
+        partition_keys=("DEX",),
+    ),
+    Dataset(
+        name="df8",
+        title="DEX market share by number of swaps",
+        url="https://flipsidecrypto.xyz/edit/queries/2a8af4da-70da-4079-b8d4-96ad90e017cb",
+        schema={"DATE": DATE, "DEX": DIM, "NUMBER_OF_SWAPS": COUNT, "PCT_SHARE": RATIO},
+        partition_keys=("DEX",),
+    ),
+    Dataset(
+        name="df9",
+        title="Uniswap daily activity, retail users vs whales",
+        url="https://flipsidecrypto.xyz/edit/queries/397fbf4c-9cae-4031-8481-4eb8ba0f984e",
+        schema={"DATE": DATE, "PERIOD": PERIOD, "CATEGORY": DIM, "ACTIVE_USERS": COUNT,
+                "NUMBER_OF_SWAPS": COUNT, "TXN_PER_USER": RATIO, "VOLUME_USD": USD},
+        partition_keys=("CATEGORY",),
+    ),
+    Dataset(
+        name="df10",
+        title="Uniswap daily new pools",
+        url="https://flipsidecrypto.xyz/edit/queries/a1bce87c-9ecc-4b46-a289-bccdec9d4791",
+        schema={"DATE": DATE, "PERIOD": PERIOD, "NEW_POOLS_CREATED": COUNT},
+    ),
+    Dataset(
+        name="df11",
+        title="Uniswap daily new pools by chain",
+        url="https://flipsidecrypto.xyz/edit/queries/34ce1816-880e-4f05-85a4-3869152435fb",
+        schema={"DATE": DATE, "PERIOD": PERIOD, "CHAIN": DIM, "NEW_POOLS_CREATED": COUNT},
+        partition_keys=("CHAIN",),
+    ),
+]}
+
+
+def get_dataset(name):
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise KeyError(f"unknown dataset {name!r}, expected one of {sorted(DATASETS)}") from None
+
+
+def source_url(name):
+    """Link to the Flipside query a dataset was exported from."""
+    return get_dataset(name).url
+
+
+def dataset_version(name):
+    """Token that changes whenever a dataset's content or declared schema does.
+
+    Anything derived from a dataset (indexes, figures) is cached under it.
+    """
+    ds = get_dataset(name)
+    return f"{store.file_version(ds.path)[:16]}-{store.schema_token(ds.schema)}"
+
+
+def load_dataset(name, columns=None):
+    """Return a shallow copy of the shared, read-only frame for ``name``.
+
+    A page may change its copy (see ``fee_impact.cache``) without affecting
+    other sessions. ``columns`` limits the load to the columns a chart reads;
+    each set is cached on its own, in schema order.
+    """
+    ds = get_dataset(name)
+    if columns is not None:
+        unknown = sorted(set(columns) - set(ds.columns))
+        if unknown:
+            raise KeyError(f"dataset {name!r} has no columns {unknown}")
+        columns = [col for col in ds.columns if col in columns]
+    with phase("load", name):
+        return load_csv(ds.path, ds.schema, columns)
+
+
+def memory_report(names=None):
+    """Compare each dataset's in-memory size with a plain ``pd.read_csv`` load."""
+    rows = []
+    for name in names or DATASETS:
+        ds = get_dataset(name)
+        compact = load_dataset(name).memory_usage(deep=True).sum()
+        plain = pd.read_csv(ds.path).memory_usage(deep=True).sum()
+        rows.append({"dataset": name, "rows": len(load_dataset(name)),
+                     "plain_bytes": plain, "compact_bytes": compact,
+                     "ratio": round(plain / compact, 1)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(memory_report().to_string(index=False))
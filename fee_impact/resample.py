@@ -0,0 +1,73 @@
+"""Server-side time bucketing and downsampling of chart data.
+
+Every chart plots one row per day, so payloads grow with history. At a coarser
+resolution each trace is re-aggregated to one point per week or month before
+the figure is built, and dense line/area traces can additionally be thinned
+with Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape of a
+series with a fixed number of points.
+"""
+
+import numpy as np
+import pandas as pd
+
+# resolution -> pandas period alias (None keeps the native grain)
+RESOLUTIONS = {"daily": None, "weekly": "W", "monthly": "M"}
+
+
+def bucket(df, x, y, by, resolution):
+    """Re-aggregate ``df`` to one row per ``resolution`` bucket and ``by`` group.
+
+    Each bucket holds the average value per observed timestamp: the group's
+    sum divided by the number of distinct timestamps in the whole bucket.
+    That keeps the "daily" meaning of every metric, is valid for
+    non-additive ones such as unique swappers or market share, and keeps
+    stacked bars correct when a fee change splits a bucket between periods.
+    """
+    freq = RESOLUTIONS[resolution]
+    if freq is None:
+        return df
+    starts = df[x].dt.to_period(freq).dt.start_time.rename(x)
+    samples = df[x].groupby(starts).nunique()
+    sums = df.groupby([starts, *[df[col] for col in by]], observed=True)[y].sum()
+    out = sums.div(samples, level=x).rename(y).reset_index()
+    return out.sort_values([x, *by], kind="stable").reset_index(drop=True)
+
+
+def lttb(x, y, n):
+    """Indices of the ``n`` points LTTB keeps from the series ``(x, y)``."""
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # first and last points are always kept; the rest fall into n - 2 buckets
+    keep = np.empty(n, dtype="int64")
+    keep[0], keep[-1] = 0, size - 1
+    every = (size - 2) / (n - 2)
+    a = 0
+    for i in range(n - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt_hi = min(int((i + 2) * every) + 1, size)
+        if i == n - 3:
+            hi, nxt_hi = size - 1, size
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = y[hi:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(df, x, y, by, max_points):
+    """Thin every ``by`` trace of ``df`` to at most ``max_points`` with LTTB."""
+    parts = []
+    traces = df.groupby(list(by), observed=True, sort=False) if by else [(None, df)]
+    for _, trace in traces:
+        if len(trace) > max_points:
+            xs = trace[x].to_numpy()
+            if np.issubdtype(xs.dtype, np.datetime64):
+                xs = xs.astype("datetime64[ns]").astype("int64")
+            trace = trace.iloc[lttb(xs, trace[y].to_numpy(), max_points)]
+        parts.append(trace)
+    return pd.concat(parts).sort_values(x, kind="stable") if parts else df
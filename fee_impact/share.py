@@ -0,0 +1,106 @@
+"""Market-share helpers for the multi-DEX datasets (df6, df7, df8).
+
+The exports' ``PCT_SHARE`` is computed against one fixed set of DEXs. To
+compare Uniswap with any subset of competitors instead, each dataset's
+activity column is pivoted once per version into a date x DEX matrix, and
+the shares within a subset are its columns divided by their row sums.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from fee_impact.cache import freeze
+from fee_impact.registry import dataset_version, load_dataset
+
+# df6 already folds minor venues into this label, so the tail joins it
+OTHER = "others"
+
+# always kept as its own series: the subject of the dashboard
+ALWAYS_SHOWN = ("uniswap",)
+
+# dataset -> the activity column its shares are computed from
+SOURCES = {"df6": "VOLUME_USD", "df7": "ACTIVE_USERS", "df8": "NUMBER_OF_SWAPS"}
+
+
+def top_n(df, x, key, y, n, keep=ALWAYS_SHOWN):
+    """Keep the ``n`` largest ``key`` series by total ``y`` and sum the rest into OTHER.
+
+    Series listed in ``keep`` are shown even when they fall outside the top
+    ``n``. The result is sorted by ``x`` with OTHER as the last category, so
+    it stacks on top of every chart.
+    """
+    totals = df.groupby(key, observed=True)[y].sum().drop(OTHER, errors="ignore")
+    if len(totals) <= n:
+        return df
+    ranked = list(totals.nlargest(n).index)
+    ranked += [k for k in keep if k in totals.index and k not in ranked]
+    order = [k for k in totals.sort_values(ascending=False).index if k in ranked] + [OTHER]
+
+    labels = df[key].astype(str)
+    folded = pd.Categorical(labels.where(labels.isin(ranked), OTHER), categories=order, ordered=True)
+    out = (df.groupby([df[x], pd.Series(folded, index=df.index, name=key)], observed=True)[y]
+           .sum()
+           .reset_index())
+    return out.sort_values([x, key], kind="stable").reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class ShareMatrix:
+    dates: object       # DatetimeIndex, one row per date
+    dexes: tuple
+    values: object      # float64 array, dates x dexes
+
+    def columns(self, dexes):
+        position = {dex: i for i, dex in enumerate(self.dexes)}
+        return [position[dex] for dex in dexes if dex in position]
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _matrix(name, version):
+    wide = load_dataset(name, ["DATE", "DEX", SOURCES[name]]).pivot_table(
+        index="DATE", columns="DEX", values=SOURCES[name], aggfunc="sum", observed=True, fill_value=0)
+    return ShareMatrix(wide.index, tuple(str(dex) for dex in wide.columns),
+                       freeze(np.ascontiguousarray(wide.to_numpy(dtype="float64"))))
+
+
+def share_matrix(name):
+    return _matrix(name, dataset_version(name))
+
+
+def dexes(names=tuple(SOURCES)):
+    """Every DEX that appears in any of ``names``, largest first by total activity."""
+    totals = {}
+    for name in names:
+        m = share_matrix(name)
+        for dex, total in zip(m.dexes, m.values.sum(axis=0) / m.values.sum()):
+            totals[dex] = totals.get(dex, 0) + total
+    return sorted(totals, key=totals.get, reverse=True)
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _subset(name, version, universe):
+    m = share_matrix(name)
+    cols = m.columns(universe)
+    sub = m.values[:, cols]
+    totals = sub.sum(axis=1)
+    active = totals > 0
+    shares = 100 * sub[active] / totals[active, None]
+    picked = [m.dexes[i] for i in cols]
+    return freeze(pd.DataFrame({
+        "DATE": np.repeat(m.dates[active].to_numpy(), len(cols)),
+        "DEX": pd.Categorical(np.tile(picked, int(active.sum())), categories=picked),
+        SOURCES[name]: sub[active].ravel(),
+        "PCT_SHARE": shares.ravel().astype("float32"),
+    }))
+
+
+def subset_shares(name, universe):
+    """Each DEX's daily share of the activity of ``universe`` alone.
+
+    DEXs of ``universe`` missing from the dataset are ignored; dates on which
+    none of them was active are dropped.
+    """
+    return _subset(name, dataset_version(name), tuple(sorted(universe))).copy(deep=False)
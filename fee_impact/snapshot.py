@@ -0,0 +1,361 @@
+"""Static HTML snapshot of every page, for serving without a Python runtime.
+
+``python -m fee_impact.snapshot OUT`` runs ``🏠_Home.py`` and each script
+under ``pages/`` once, headlessly, with every widget at its default, and
+writes what they rendered as plain files:
+
+- ``OUT/index.html`` and ``OUT/<page>.html``: text, insights, metric cards
+  and tables, with a navigation bar between the pages
+- ``OUT/figures/<sha1>.json``: one file per distinct figure
+- ``OUT/assets/``: plotly.js, the lazy loader and the stylesheet, shared by
+  every page
+
+Pages embed no figure data: each chart is a placeholder whose JSON is
+fetched when it scrolls into view. Figure files are named after their
+content, so a figure used on several pages is stored once and can be cached
+forever.
+
+The pages' own switches are exported too. For the widgets listed in
+``VARIANTS`` (the Chain Reaction metric, and the fee change and metric of
+the Conclusion ranking) the page is rendered once per combination of
+options; the blocks every combination shares are written once, and the rest
+becomes one section per combination, with an anchor (``#metric-swaps``)
+and a menu of links to each. Every other widget, including the sidebar, is
+shown with the default value the snapshot was rendered with.
+
+The data only changes on a refresh, so export again after one and serve
+``OUT`` from any static file server (``python -m http.server -d OUT``).
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import os
+import re
+
+from plotly.offline import get_plotlyjs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOME = "🏠_Home.py"
+FIGURES_DIR = "figures"
+ASSETS_DIR = "assets"
+
+# page -> keys of the widgets whose every option is exported, outermost first
+VARIANTS = {
+    "pages/3_🔗_Chain_Reaction.py": ("metric",),
+    "pages/4_🏁_Conclusion.py": ("change", "metric"),
+}
+
+# The streamlit plotly theme leaves placeholder colors in the figure for the
+# browser to swap for the active theme's; these are the light theme's.
+THEME_COLORS = {
+    **dict(zip([f"#{i:06d}" for i in range(1, 11)],
+               ["#0068c9", "#83c9ff", "#ff2b2b", "#ffabab", "#29b09d",
+                "#7defa1", "#ff8700", "#ffd16a", "#6d3fc0", "#d5dae5"])),
+    **dict(zip([f"#{i:06d}" for i in range(11, 21)],
+               ["#e4f5ff", "#c7ebff", "#a6dcff", "#83c9ff", "#60b4ff",
+                "#3d9df3", "#1c83e1", "#0068c9", "#0054a3", "#004280"])),
+    **dict(zip([f"#{i:06d}" for i in range(21, 31)],
+               ["#7d353b", "#bd4043", "#ff4b4b", "#ff8c8c", "#ffc7c7",
+                "#a6dcff", "#60b4ff", "#1c83e1", "#0054a3", "#004280"])),
+    "#000032": "#29b09d", "#000033": "#ff2b2b", "#000034": "#0068c9",
+    "#000035": "#d5dae5", "#000036": "#a3a8b8", "#000037": "#31333f",
+    "#000038": "#ffffff", "#000039": "rgba(49, 51, 63, 0.1)",
+    "#000040": "#f0f2f6",
+}
+_placeholder = re.compile("|".join(sorted(THEME_COLORS, reverse=True)))
+
+LOADER = """\
+// Draw each chart once it is about to scroll into view.
+const observer = new IntersectionObserver((entries) => {
+  for (const entry of entries) {
+    if (!entry.isIntersecting) continue;
+    observer.unobserve(entry.target);
+    fetch(entry.target.dataset.src)
+      .then((response) => response.json())
+      .then((fig) => Plotly.newPlot(entry.target, fig.data, fig.layout,
+                                    {responsive: true, displaylogo: false}));
+  }
+}, {rootMargin: "400px"});
+document.querySelectorAll(".chart[data-src]").forEach((el) => observer.observe(el));
+"""
+
+STYLESHEET = """\
+body { font-family: sans-serif; margin: 0; color: #31333f; }
+nav { display: flex; gap: 1.5rem; padding: 1rem 2rem; background: #f0f2f6; }
+nav a { color: #31333f; text-decoration: none; }
+nav a.current { font-weight: bold; }
+main { max-width: 1400px; margin: 0 auto; padding: 1rem 2rem; }
+.row { display: flex; flex-wrap: wrap; gap: 1rem; }
+.column { flex: 1 1 0; min-width: 0; }
+.chart { height: 450px; }
+.button { display: inline-block; padding: 0.25rem 0.75rem; border: 1px solid #d5dae5;
+          border-radius: 0.5rem; color: #31333f; text-decoration: none; }
+.alert { padding: 1rem; border-radius: 0.5rem; background: #e4f5ff; margin: 0.5rem 0; }
+.caption, .control { color: #808495; font-size: 0.875rem; }
+.variant-menu { display: flex; flex-wrap: wrap; gap: 0.25rem 1rem; margin: 1rem 0; }
+.variant { display: none; }
+.variant:target, .variants:not(:has(.variant:target)) .variant.default { display: block; }
+div[data-testid="metric-container"] { margin-bottom: 0.5rem; }
+.metric-value { font-size: 2rem; }
+.metric-delta.green { color: #09ab3b; }
+.metric-delta.red { color: #ff2b2b; }
+table { border-collapse: collapse; font-size: 0.875rem; }
+th, td { padding: 0.25rem 0.5rem; border-bottom: 1px solid #e6eaf1; text-align: right; }
+"""
+
+PAGE = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{assets}/snapshot.css">
+<script src="{assets}/plotly.min.js" defer></script>
+<script src="{assets}/snapshot.js" defer></script>
+</head>
+<body>
+<nav>{nav}</nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+def page_scripts():
+    """The app's scripts in navigation order, Home first."""
+    return [HOME] + sorted(os.path.relpath(path, ROOT)
+                           for path in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def page_title(script):
+    """``pages/1_⚔️_The_Retailer_&_The_Whale.py`` -> ``The Retailer & The Whale``."""
+    stem = os.path.splitext(os.path.basename(script))[0]
+    stem = re.sub(r"^\d+_", "", stem).replace("_", " ")
+    return re.sub(r"^\W+", "", stem).strip()
+
+
+def page_file(script):
+    if script == HOME:
+        return "index.html"
+    return _slug(page_title(script)) + ".html"
+
+
+class Exporter:
+    """Writes the pages of one snapshot, collecting its figure files."""
+
+    def __init__(self, out):
+        self.out = out
+        self.figures = set()
+
+    def figure(self, spec):
+        """Store a figure's JSON under its content hash and return its path."""
+        spec = _placeholder.sub(lambda m: THEME_COLORS[m.group(0)], spec)
+        name = hashlib.sha1(spec.encode()).hexdigest() + ".json"
+        if name not in self.figures:
+            self.figures.add(name)
+            _write(os.path.join(self.out, FIGURES_DIR, name), spec)
+        return f"{FIGURES_DIR}/{name}"
+
+    def render(self, node):
+        return "\n".join(self.blocks(node))
+
+    def blocks(self, node):
+        """HTML of each top-level element of ``node``."""
+        return [html for html in (self.element(el) for el in node.children.values()) if html]
+
+    def variants(self, app, script, keys, chosen=()):
+        """Yield ``(((key, option), ...), blocks)`` for every option of the widgets ``keys``."""
+        if not keys:
+            yield chosen, self.blocks(app.main)
+            return
+        for option in list(_widget(app, keys[0]).options):
+            _widget(app, keys[0]).set_value(option)
+            _run(app, script)
+            yield from self.variants(app, script, keys[1:], chosen + ((keys[0], option),))
+
+    def render_variants(self, app, script, keys):
+        """The page with one section per combination of the options of ``keys``."""
+        labels = {key: _widget(app, key).label for key in keys}
+        default = tuple((key, str(_widget(app, key).value)) for key in keys)
+        rendered = list(self.variants(app, script, keys))
+        shared = [blocks for _, blocks in rendered]
+        head = _common(shared)
+        tail = _common([blocks[head:][::-1] for blocks in shared])
+
+        menu, sections = [], []
+        for chosen, blocks in rendered:
+            anchor = "-".join(f"{key}-{_slug(option)}" for key, option in chosen)
+            title = " · ".join(f"{labels[key]}: {option}" for key, option in chosen)
+            menu.append(f'<a href="#{anchor}">{html.escape(title)}</a>')
+            classes = "variant default" if chosen == default else "variant"
+            sections.append(f'<section id="{anchor}" class="{classes}">'
+                            f"<h3>{html.escape(title)}</h3>\n"
+                            + "\n".join(blocks[head:len(blocks) - tail]) + "</section>")
+        names = " and ".join(labels.values())
+        switch = (f'<p class="caption">Every option of {html.escape(names)}; '
+                  f"other controls show their default.</p>"
+                  f'<nav class="variant-menu">{"".join(menu)}</nav>')
+        first = shared[0]
+        return "\n".join([*first[:head], switch,
+                          f'<div class="variants">{"".join(sections)}</div>',
+                          *first[len(first) - tail:]])
+
+    def element(self, el):
+        kind = el.type
+        proto = getattr(el, "proto", None)
+        if kind == "flex_container":
+            horizontal = proto.flex_container.direction == proto.flex_container.HORIZONTAL
+            return f'<div class="{"row" if horizontal else "stack"}">{self.render(el)}</div>'
+        if kind == "column":
+            return f'<div class="column" style="flex-grow: {proto.weight or 1}">{self.render(el)}</div>'
+        if hasattr(el, "children"):
+            return self.render(el)
+        if kind == "markdown":
+            return _markdown(proto.body)
+        if kind in ("heading", "title", "header", "subheader"):
+            level = proto.tag or "h2"
+            return f"<{level}>{_inline(proto.body)}</{level}>"
+        if kind == "caption":
+            return f'<p class="caption">{_inline(proto.body)}</p>'
+        if kind in ("info", "success", "warning", "error"):
+            icon = f"{proto.icon} " if proto.icon else ""
+            return f'<div class="alert {kind}">{icon}{_inline(proto.body)}</div>'
+        if kind == "metric":
+            return _metric(proto)
+        if kind == "dataframe":
+            return el.value.to_html(border=0, na_rep="", float_format=lambda v: f"{v:,.2f}")
+        if kind == "plotly_chart":
+            return f'<div class="chart" data-src="{self.figure(proto.spec)}"></div>'
+        if kind == "link_button":
+            return (f'<a class="button" href="{html.escape(proto.url)}" target="_blank" '
+                    f'rel="noopener">{html.escape(proto.label)}</a>')
+        if hasattr(el, "label") and hasattr(el, "value"):
+            return _control(el.label, el.value)
+        return f"<!-- {kind} is not exported -->"
+
+    def page(self, script, body):
+        nav = "".join(f'<a href="{page_file(s)}"{" class=current" if s == script else ""}>'
+                      f"{html.escape(page_title(s))}</a>" for s in page_scripts())
+        _write(os.path.join(self.out, page_file(script)),
+               PAGE.format(title=html.escape(page_title(script)), assets=ASSETS_DIR,
+                           nav=nav, body=body))
+
+    def assets(self):
+        folder = os.path.join(self.out, ASSETS_DIR)
+        _write(os.path.join(folder, "plotly.min.js"), get_plotlyjs())
+        _write(os.path.join(folder, "snapshot.js"), LOADER)
+        _write(os.path.join(folder, "snapshot.css"), STYLESHEET)
+
+    def prune(self):
+        """Delete figure files left over from earlier snapshots."""
+        folder = os.path.join(self.out, FIGURES_DIR)
+        for name in os.listdir(folder):
+            if name.endswith(".json") and name not in self.figures:
+                os.remove(os.path.join(folder, name))
+
+
+def export(out, scripts=None, timeout=300):
+    """Render ``scripts`` (default: every page) into ``out``; return the page files."""
+    from streamlit.testing.v1 import AppTest
+
+    exporter = Exporter(out)
+    written = []
+    for script in scripts or page_scripts():
+        app = AppTest.from_file(os.path.join(ROOT, script), default_timeout=timeout)
+        _run(app, script)
+        if script in VARIANTS:
+            body = exporter.render_variants(app, script, VARIANTS[script])
+        else:
+            body = exporter.render(app.main)
+        exporter.page(script, body)
+        written.append(page_file(script))
+    exporter.assets()
+    if scripts is None:
+        exporter.prune()
+    return written
+
+
+def _run(app, script):
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"{script} failed: {app.exception[0].message}")
+
+
+def _widget(app, key):
+    for widgets in (app.radio, app.selectbox, app.select_slider):
+        for widget in widgets:
+            if widget.key == key:
+                return widget
+    raise KeyError(f"no radio or selectbox with key {key!r}")
+
+
+def _common(lists):
+    """Length of the prefix all of ``lists`` share."""
+    n = 0
+    while all(len(items) > n and items[n] == lists[0][n] for items in lists):
+        n += 1
+    return n
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-")
+
+
+def _metric(proto):
+    delta = ""
+    if proto.delta:
+        color = {proto.RED: "red", proto.GREEN: "green"}.get(proto.color, "gray")
+        delta = f'<div class="metric-delta {color}">{html.escape(proto.delta)}</div>'
+    return (f'<div data-testid="metric-container" title="{html.escape(proto.help)}">'
+            f'<label data-testid="stMetricLabel"><div>{html.escape(proto.label)}</div></label>'
+            f'<div class="metric-value">{html.escape(proto.body)}</div>{delta}</div>')
+
+
+def _control(label, value):
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(map(str, value)) or "none"
+    return (f'<p class="control">{html.escape(str(label))}: '
+            f"<b>{html.escape(str(value))}</b></p>")
+
+
+def _markdown(text):
+    """HTML for the markdown the pages write: raw HTML, headings and paragraphs."""
+    if text.lstrip().startswith("<"):
+        return text
+    blocks = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        heading = re.match(r"(#{1,6})\s+(.*)", block, re.S)
+        if heading:
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif block.strip():
+            blocks.append(f"<p>{_inline(block)}</p>")
+    return "\n".join(blocks)
+
+
+def _inline(text):
+    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = re.sub(r"(?<!\*)\*([^*\n]+)\*(?!\*)", r"<i>\1</i>", text)
+    return re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export every page as static HTML.")
+    parser.add_argument("out", help="output directory")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds per page run")
+    args = parser.parse_args()
+    pages = export(args.out, timeout=args.timeout)
+    figures = len(os.listdir(os.path.join(args.out, FIGURES_DIR)))
+    print(f"{len(pages)} pages and {figures} figures written to {args.out}")
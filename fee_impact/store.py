@@ -0,0 +1,208 @@
+"""Columnar (Arrow IPC) copies of the ``data/`` CSV exports.
+
+The CSVs stay the source of truth. ``python -m fee_impact.store`` writes a
+typed, uncompressed Arrow IPC file next to each of them under
+``data/columnar/``; uncompressed IPC can be memory-mapped, so a load only
+touches the pages of the columns it asks for. Each columnar file records the
+version of the CSV it was built from and is ignored once the CSV changes, in
+which case the loader falls back to parsing the CSV.
+
+A CSV's version is its sha1, unless ``python -m fee_impact.ingest`` last
+wrote it: the ingest records a counter in ``data/manifest.json`` along with
+the file's size and mtime, so a refreshed file never needs re-hashing.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+COLUMNAR_DIR = "columnar"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+SOURCE_KEY = b"source_sha1"
+MANIFEST = "manifest.json"
+
+_lock = threading.Lock()
+_digests = {}   # path -> ((size, mtime_ns), sha1)
+_manifests = {}  # folder -> ((size, mtime_ns), entries)
+
+
+def file_digest(path):
+    """Return the sha1 of ``path``, re-hashing only when its stat changes."""
+    info = os.stat(path)
+    stamp = (info.st_size, info.st_mtime_ns)
+    with _lock:
+        known = _digests.get(path)
+    if known is not None and known[0] == stamp:
+        return known[1]
+
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha1").hexdigest()
+    with _lock:
+        _digests[path] = (stamp, digest)
+    return digest
+
+
+def columnar_path(csv_path):
+    folder, name = os.path.split(csv_path)
+    return os.path.join(folder, COLUMNAR_DIR, os.path.splitext(name)[0] + ".arrow")
+
+
+def read_manifest(folder):
+    """Return the ingest manifest of ``folder`` (``{}`` when there is none)."""
+    path = os.path.join(folder, MANIFEST)
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    stamp = (info.st_size, info.st_mtime_ns)
+    with _lock:
+        known = _manifests.get(folder)
+    if known is not None and known[0] == stamp:
+        return known[1]
+
+    with open(path) as f:
+        entries = json.load(f)
+    with _lock:
+        _manifests[folder] = (stamp, entries)
+    return entries
+
+
+def file_version(path):
+    """Token that changes whenever the content of ``path`` does.
+
+    The ingest manifest's counter when it describes the file as it is on
+    disk, otherwise the file's sha1.
+    """
+    folder, name = os.path.split(path)
+    entry = read_manifest(folder).get(name)
+    if entry is not None:
+        info = os.stat(path)
+        if [info.st_size, info.st_mtime_ns] == entry["stat"]:
+            return f"v{entry['version']}"
+    return file_digest(path)
+
+
+def read_source_csv(csv_path, schema=None, columns=None):
+    """Parse a Flipside CSV export into the column types given by ``schema``.
+
+    The exports end with a junk line (a stray BOM or a row of empty fields),
+    so rows without a parseable DATE are dropped.
+    """
+    df = pd.read_csv(csv_path, usecols=_with_date(columns))
+    df["DATE"] = pd.to_datetime(df["DATE"], format=DATE_FORMAT, errors="coerce")
+    df = df.dropna(subset=["DATE"]).reset_index(drop=True)
+    if schema:
+        df = _apply_schema(df, schema)
+    return df if columns is None else df[list(columns)]
+
+
+def source_stamp(csv_path, schema=None):
+    """Identify the CSV content and schema a columnar copy was built from."""
+    return f"{file_version(csv_path)}:{schema_token(schema)}".encode()
+
+
+def convert(csv_path, schema=None):
+    """Write the columnar copy of ``csv_path`` and return its path."""
+    table = pa.Table.from_pandas(read_source_csv(csv_path, schema), preserve_index=False)
+    return write_columnar(csv_path, table, schema)
+
+
+def write_columnar(csv_path, table, schema=None):
+    """Store ``table`` as the columnar copy of the current ``csv_path``."""
+    return write_ipc(columnar_path(csv_path), table, source_stamp(csv_path, schema))
+
+
+def write_ipc(path, table, stamp):
+    """Atomically write ``table`` to ``path`` as uncompressed Arrow IPC."""
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), SOURCE_KEY: stamp})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+
+def read_ipc(path, stamp):
+    """Memory-map the table at ``path``, or None if missing or not built from ``stamp``."""
+    if not os.path.exists(path):
+        return None
+    reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+    if (reader.schema.metadata or {}).get(SOURCE_KEY) != stamp:
+        return None
+    return reader.read_all()
+
+
+def read_columnar(csv_path, schema=None, columns=None):
+    """Memory-map the columnar copy of ``csv_path``.
+
+    Returns None when there is no columnar copy or it was built from a
+    different version of the CSV or schema.
+    """
+    table = read_ipc(columnar_path(csv_path), source_stamp(csv_path, schema))
+    if table is None:
+        return None
+    if columns is not None:
+        table = table.select(list(columns))
+    return table.to_pandas(split_blocks=True)
+
+
+def load(csv_path, schema=None, columns=None):
+    """Load a dataset from its columnar copy, falling back to the CSV."""
+    df = read_columnar(csv_path, schema, columns)
+    if df is None:
+        df = read_source_csv(csv_path, schema, columns)
+    return df
+
+
+def column_dtypes(df, schema):
+    """The dtypes the columns of ``df`` load as under ``schema``.
+
+    Counts are int32, which cannot hold a missing value; the exports write
+    ``null`` for one now and then, so a count column with missing values
+    loads as the nullable Int32 instead of failing the whole dataset.
+    """
+    dtypes = {}
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if isinstance(dtype, str) and dtype.startswith("int") and df[col].isna().any():
+            dtype = dtype.capitalize()
+        dtypes[col] = dtype
+    return dtypes
+
+
+def _apply_schema(df, schema):
+    typed = df.astype(column_dtypes(df, schema))
+    # a categorical with fixed categories silently turns unknown values into NaN
+    lost = [col for col in typed.columns if typed[col].isna().sum() > df[col].isna().sum()]
+    if lost:
+        raise ValueError(f"values outside the declared categories in columns {lost}")
+    return typed
+
+
+def schema_token(schema):
+    if not schema:
+        return ""
+    return hashlib.sha1(repr(sorted(schema.items())).encode()).hexdigest()[:12]
+
+
+def _with_date(columns):
+    if columns is None or "DATE" in columns:
+        return columns
+    return ["DATE", *columns]
+
+
+if __name__ == "__main__":
+    from fee_impact.registry import DATASETS
+
+    parser = argparse.ArgumentParser(description="Convert the data/ CSVs to Arrow IPC.")
+    parser.add_argument("names", nargs="*", default=list(DATASETS))
+    for name in parser.parse_args().names:
+        ds = DATASETS[name]
+        print(f"{ds.path} -> {convert(ds.path, ds.schema)}")
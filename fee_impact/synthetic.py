@@ -0,0 +1,189 @@
+"""Deterministic synthetic versions of the df1-df11 exports at any scale.
+
+The shipped data is a few thousand daily rows over 7 chains. This generates
+schema-compatible CSVs with any number of days, chains, DEXs and Uniswap
+versions, at daily or hourly grain, so load, filter and render costs can be
+measured as the data grows. Point the app or the benchmarks at the output
+with ``FEE_IMPACT_DATA_DIR``.
+
+Dates start on 2023-06-01 by default and fee periods switch on the real
+dates (0.15% on 2023-10-17, 0.25% on 2024-04-15), so longer histories extend
+into the 0.25% period the way future exports will. Each series is a
+per-segment level times a slowly drifting random factor, a weekly cycle and
+a short dip after the 0.25% hike; the same seed always gives the same files.
+
+    python -m fee_impact.synthetic --out data/synthetic --days 4000 --chains 30 --dexes 120
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from fee_impact.registry import DATASETS, FEE_CHANGES, PERIODS
+
+FEE_CHANGES = pd.to_datetime(list(FEE_CHANGES.values()))
+
+CHAINS = ["Arbitrum", "Avalanche", "Base", "BSC", "Ethereum", "Optimism", "Polygon"]
+PLATFORMS = ["uniswap-v2", "uniswap-v3"]
+CATEGORIES = ["Retail User", "Whale"]
+DEXES = ["uniswap", "pancakeswap", "trader joe", "quickswap", "sushiswap", "camelot", "woofi",
+         "aerodrome", "balancer", "maverick", "ramses-v2", "curve", "biswap", "velodrome",
+         "kyberswap", "dodo", "gmx", "baseswap", "alienbase", "beethoven-x", "dackieswap",
+         "fraxswap", "hashflow", "level-finance", "pangolin", "platypus", "sparta",
+         "swapbased", "synthetix", "voodoo", "zyberswap"]
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.000"
+
+
+def _names(real, n, prefix):
+    return real[:n] + [f"{prefix}-{i}" for i in range(len(real) + 1, n + 1)]
+
+
+def timeline(days, start="2023-06-01", hourly=False):
+    if hourly:
+        return pd.date_range(start, periods=days * 24, freq="h")
+    return pd.date_range(start, periods=days, freq="D")
+
+
+def period_labels(dates):
+    return np.asarray(PERIODS)[np.searchsorted(FEE_CHANGES.values, dates.values, side="right")]
+
+
+def activity(rng, dates, levels, drift=0.25, window=30):
+    """T x S matrix of positive values around ``levels`` (one per segment)."""
+    steps = len(dates)
+    hourly = steps > 1 and (dates[1] - dates[0]) < pd.Timedelta(days=1)
+    per_day = 24 if hourly else 1
+
+    # slow drift: white noise smoothed with a moving average of ``window`` days
+    width = window * per_day
+    noise = rng.normal(0, 1, (steps + width, len(levels)))
+    sums = np.cumsum(noise, axis=0)
+    smooth = (sums[width:] - sums[:-width]) / np.sqrt(width)
+
+    day = np.asarray(dates.dayofweek)[:, None]
+    weekly = 1 + 0.08 * np.cos(2 * np.pi * day / 7)
+
+    # a dip after the 0.25% hike that fades over about a month
+    since = np.asarray((dates - FEE_CHANGES[-1]) / pd.Timedelta(days=1))[:, None]
+    sensitivity = rng.uniform(0.05, 0.3, len(levels))
+    hike = np.where(since >= 0, 1 - sensitivity * np.exp(-np.clip(since, 0, None) / 30), 1)
+
+    values = np.asarray(levels) * np.exp(drift * smooth) * weekly * hike
+    if hourly:
+        hour = np.asarray(dates.hour)[:, None]
+        values = values * (1 + 0.4 * np.sin(2 * np.pi * (hour - 6) / 24)) / 24
+    return values
+
+
+def _long(dates, key, keys, columns):
+    """Stack T x S matrices into the exports' long layout (date-major)."""
+    steps, width = len(dates), len(keys)
+    frame = {"DATE": np.repeat(dates.values, width),
+             "PERIOD": np.repeat(period_labels(dates), width)}
+    if key is not None:
+        frame[key] = np.tile(np.asarray(keys, dtype=object), steps)
+    for name, matrix in columns.items():
+        frame[name] = np.asarray(matrix).reshape(steps * width)
+    return pd.DataFrame(frame)
+
+
+def _levels(rng, base, n):
+    return base * rng.lognormal(0, 1, n)
+
+
+def _counts(matrix):
+    return np.maximum(np.rint(matrix), 0).astype("int64")
+
+
+def _shares(rng, dates, dexes, base, column):
+    levels = base / np.arange(1, len(dexes) + 1) ** 1.1   # Zipf-like market
+    values = activity(rng, dates, levels, drift=0.5)
+    if column != "VOLUME_USD":
+        values = _counts(values)
+    shares = np.round(100 * values / values.sum(axis=1, keepdims=True), 6)
+    df = _long(dates, "DEX", dexes, {column: np.round(values, 2), "PCT_SHARE": shares})
+    return df.drop(columns="PERIOD")
+
+
+def generate(days=412, chains=7, dexes=31, platforms=2, hourly=False, start="2023-06-01", seed=0):
+    """Return ``{name: DataFrame}`` for df1-df11 in the exports' column order."""
+    rng = np.random.default_rng(seed)
+    dates = timeline(days, start, hourly)
+    chain_names = _names(CHAINS, chains, "Chain")
+    platform_names = _names(PLATFORMS, platforms, "uniswap-v")
+    dex_names = _names(DEXES, dexes, "dex")
+
+    # per chain: one shared activity factor, scaled per metric
+    chain_activity = activity(rng, dates, _levels(rng, 1.0, chains))
+    df3 = _long(dates, "CHAIN", chain_names, {
+        "VOLUME_USD": np.round(chain_activity * 1.5e8 * rng.uniform(0.8, 1.2, chains), 2),
+        "SWAPS": _counts(chain_activity * 9e4),
+        "UNIQUE_SWAPPERS": _counts(chain_activity * 2.3e4),
+        "ACTIVE_POOLS": _counts(chain_activity * 1.2e3),
+    })
+    df5 = _long(dates, "CHAIN", chain_names,
+                {"NEW_USERS": _counts(activity(rng, dates, _levels(rng, 6e3, chains), drift=0.4))})
+    df11 = _long(dates, "CHAIN", chain_names,
+                 {"NEW_POOLS_CREATED": _counts(activity(rng, dates, _levels(rng, 20, chains), drift=0.5))})
+
+    platform_activity = activity(rng, dates, _levels(rng, 1.0, platforms))
+    df2 = _long(dates, "PLATFORM", platform_names, {
+        "VOLUME_USD": np.round(platform_activity * 4e8, 2),
+        "SWAPS": _counts(platform_activity * 3e5),
+        "UNIQUE_SWAPPERS": _counts(platform_activity * 9e4),
+        "ACTIVE_POOLS": _counts(platform_activity * 4e3),
+    })
+
+    users = _counts(activity(rng, dates, [6e4, 150]))
+    swaps = np.maximum(_counts(users * activity(rng, dates, [2.6, 5.0], drift=0.1)), users)
+    df9 = _long(dates, "CATEGORY", CATEGORIES, {
+        "ACTIVE_USERS": users,
+        "NUMBER_OF_SWAPS": swaps,
+        "TXN_PER_USER": np.round(swaps / np.maximum(users, 1), 6),
+        "VOLUME_USD": np.round(activity(rng, dates, [4.6e8, 2.2e8]), 2),
+    })
+
+    by_date = ["DATE", "PERIOD"]
+    frames = {
+        "df1": df3.groupby(by_date, sort=False)[["VOLUME_USD", "SWAPS", "UNIQUE_SWAPPERS",
+                                                  "ACTIVE_POOLS"]].sum().reset_index(),
+        "df2": df2,
+        "df3": df3,
+        "df4": df5.groupby(by_date, sort=False)[["NEW_USERS"]].sum().reset_index(),
+        "df5": df5,
+        "df6": _shares(rng, dates, dex_names, 2e8, "VOLUME_USD"),
+        "df7": _shares(rng, dates, dex_names, 1e5, "ACTIVE_USERS"),
+        "df8": _shares(rng, dates, dex_names, 3e5, "NUMBER_OF_SWAPS"),
+        "df9": df9,
+        "df10": df11.groupby(by_date, sort=False)[["NEW_POOLS_CREATED"]].sum().reset_index(),
+        "df11": df11,
+    }
+    return {name: df[list(DATASETS[name].columns)] for name, df in frames.items()}
+
+
+def write(frames, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, df in frames.items():
+        df.to_csv(os.path.join(out_dir, f"{name}.csv"), index=False, date_format=DATE_FORMAT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic df1-df11 CSVs.")
+    parser.add_argument("--out", required=True, help="directory to write dfN.csv into")
+    parser.add_argument("--days", type=int, default=412)
+    parser.add_argument("--chains", type=int, default=7)
+    parser.add_argument("--dexes", type=int, default=31)
+    parser.add_argument("--platforms", type=int, default=2)
+    parser.add_argument("--hourly", action="store_true")
+    parser.add_argument("--start", default="2023-06-01")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    frames = generate(args.days, args.chains, args.dexes, args.platforms, args.hourly,
+                      args.start, args.seed)
+    write(frames, args.out)
+    for name, df in frames.items():
+        print(f"{name}: {len(df)} rows")
@@ -0,0 +1,159 @@
+"""Warm the process-wide caches in the background when the server starts.
+
+Without it the first visitor of a fresh worker pays for parsing the CSVs and
+building every figure of the page they open. ``start()`` does that work in a
+thread pool (``FEE_IMPACT_WARMUP_WORKERS``, default: one per CPU, at most 8)
+before anyone asks:
+
+1. rewrite the columnar copy of every dataset whose CSV changed, then load
+   the dataset into the shared cache
+2. run every page once without a session, which builds the figures of its
+   default view, and build the Chain Reaction charts of every metric in its
+   selectbox
+
+``status()`` reports progress and timings, and ``ready()`` turns true once
+every task has run; ``app.py`` serves both on ``/ready`` for health checks.
+``FEE_IMPACT_WARMUP=0`` turns the warm-up off.
+
+    python -m fee_impact.warmup     # warm once in this process and report
+"""
+
+import glob
+import logging
+import os
+import runpy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fee_impact import store
+from fee_impact.registry import DATASETS, load_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENABLED = os.environ.get("FEE_IMPACT_WARMUP", "1") != "0"
+WORKERS = int(os.environ.get("FEE_IMPACT_WARMUP_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+
+# warns once per Streamlit call made outside a session; pages warmed here make many
+BARE_MODE_LOGGER = "streamlit.runtime.scriptrunner_utils.script_run_context"
+THREAD_PREFIX = "warmup"
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_thread = None
+_status = {"state": "idle", "tasks": 0, "done": 0, "failed": [],
+           "started": None, "seconds": None, "timings": {}}
+
+
+class WarmupThreads(logging.Filter):
+    """Drops the records logged by warm-up threads.
+
+    A filter rather than a level, because Streamlit sets its loggers' levels
+    itself, and one that leaves the sessions served meanwhile alone.
+    """
+
+    def filter(self, record):
+        return not record.threadName.startswith(THREAD_PREFIX)
+
+
+def page_scripts():
+    return [os.path.join(ROOT, "🏠_Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def warm_dataset(name):
+    ds = DATASETS[name]
+    stamp = store.source_stamp(ds.path, ds.schema)
+    if store.read_ipc(store.columnar_path(ds.path), stamp) is None:
+        try:
+            store.convert(ds.path, ds.schema)
+        except OSError as e:    # a read-only deploy still serves from the CSV
+            log.warning("cannot write the columnar copy of %s: %s", name, e)
+    load_dataset(name)
+
+
+def warm_page(script):
+    runpy.run_path(script, run_name="__main__")
+
+
+def warm_chain_metric(metric):
+    from fee_impact.chains import chain_charts
+    from fee_impact.charts import render
+
+    for chart in chain_charts(metric):
+        render(chart)
+
+
+def _run(pool, tasks):
+    with _lock:
+        _status["tasks"] += len(tasks)
+    futures = {pool.submit(_timed, label, task, *args): label for label, task, *args in tasks}
+    for future, label in futures.items():
+        error = future.exception()
+        with _lock:
+            _status["done"] += 1
+            if error is not None:
+                _status["failed"].append(f"{label}: {error!r}")
+        if error is not None:
+            log.error("warm-up of %s failed", label, exc_info=error)
+
+
+def _timed(label, task, *args):
+    start = time.perf_counter()
+    task(*args)
+    with _lock:
+        _status["timings"][label] = round(time.perf_counter() - start, 3)
+
+
+def warm(workers=WORKERS):
+    """Run every warm-up task, blocking until all have finished."""
+    from fee_impact.chains import METRICS
+
+    quiet, bare_mode = logging.getLogger(BARE_MODE_LOGGER), WarmupThreads()
+    quiet.addFilter(bare_mode)
+    start = time.perf_counter()
+    with _lock:
+        _status.update(state="warming", started=time.time())
+    try:
+        with ThreadPoolExecutor(workers, thread_name_prefix=THREAD_PREFIX) as pool:
+            _run(pool, [(f"dataset {name}", warm_dataset, name) for name in DATASETS])
+            _run(pool, [(f"page {os.path.basename(s)}", warm_page, s) for s in page_scripts()] +
+                       [(f"chains {metric}", warm_chain_metric, metric) for metric in METRICS])
+    finally:
+        quiet.removeFilter(bare_mode)
+        with _lock:
+            _status.update(state="ready", seconds=round(time.perf_counter() - start, 3))
+    report = status()
+    log.info("warm-up finished in %.1fs (%d tasks, %d failed)",
+             report["seconds"], report["tasks"], len(report["failed"]))
+    return report
+
+
+def start():
+    """Start warming in the background, once per process; no-op when disabled."""
+    global _thread
+    with _lock:
+        if _thread is not None or not ENABLED:
+            return
+        _thread = threading.Thread(target=warm, name=THREAD_PREFIX, daemon=True)
+    _thread.start()
+
+
+def ready():
+    """Whether every warm-up task has run (always true when warm-up is off)."""
+    with _lock:
+        return not ENABLED or _status["state"] == "ready"
+
+
+def status():
+    with _lock:
+        return {**_status, "failed": list(_status["failed"]), "timings": dict(_status["timings"]),
+                "enabled": ENABLED}
+
+
+if __name__ == "__main__":
+    report = warm()
+    for label, seconds in sorted(report["timings"].items(), key=lambda item: -item[1]):
+        print(f"{label:50}{seconds:>8.2f}s")
+    print(f"\n{report['done']} tasks in {report['seconds']:.2f}s, {len(report['failed'])} failed")
+    for failure in report["failed"]:
+        print(f"FAILED {failure}")
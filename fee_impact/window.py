@@ -0,0 +1,150 @@
+"""Global date-range and fee-period filter, resolved by binary search.
+
+The sidebar's date range and fee periods become a tuple of half-open DATE
+intervals: each fee period is the span between two dates of
+``FEE_CHANGES``, so any choice of periods and dates is a few intervals of
+time. Chart data is always in date order (whole datasets, segments and
+market-share subsets alike), so each interval is found with ``searchsorted``
+on a DatetimeIndex, in O(log n) however long the history, and taken as a
+slice rather than by a boolean mask over every row.
+
+The index of each source frame and every filtered view are cached per
+dataset version and interval set, so going back to a range is a cache hit.
+
+The bounds of the date picker come from the first and last rows of each
+export, read without loading it, so the sidebar does not load every dataset
+on pages that only show a few.
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from fee_impact import store
+from fee_impact.cache import freeze
+from fee_impact.registry import DATASETS, FEE_CHANGES, PERIODS
+
+# bytes read at each end of an export for its first and last DATE
+EDGE_BYTES = 4096
+
+ONE_DAY = pd.Timedelta(days=1)
+
+# period -> (first day, first day of the next period); None is open-ended
+_starts = [None, *(pd.Timestamp(FEE_CHANGES[period]) for period in PERIODS[1:]), None]
+PERIOD_SPANS = {period: (_starts[i], _starts[i + 1]) for i, period in enumerate(PERIODS)}
+
+
+def _first_date(lines):
+    for line in lines:
+        date = pd.to_datetime(line.split(b",", 1)[0].decode(errors="replace"),
+                              format=store.DATE_FORMAT, errors="coerce")
+        if not pd.isna(date):
+            return date
+    return None
+
+
+def edge_dates(path):
+    """First and last DATE of an export, which is in date order."""
+    with open(path, "rb") as f:
+        head = f.read(EDGE_BYTES).splitlines()[1:]     # skip the header
+        f.seek(max(0, os.fstat(f.fileno()).st_size - EDGE_BYTES))
+        tail = f.read().splitlines()[::-1]              # past the junk last line
+    return _first_date(head), _first_date(tail)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _span(paths, versions):
+    edges = [edge_dates(path) for path in paths]
+    return (min(first for first, _ in edges if first is not None),
+            max(last for _, last in edges if last is not None))
+
+
+def span():
+    """First and last day of the data, across every dataset.
+
+    Cached on each file's version (``store.file_version``), so the edges are
+    re-read after an ingest or after a file is replaced by hand, and
+    otherwise cost an ``os.stat`` per file.
+    """
+    paths = tuple(ds.path for ds in DATASETS.values())
+    return _span(paths, tuple(store.file_version(path) for path in paths))
+
+
+def intervals(start=None, end=None, periods=PERIODS):
+    """DATE intervals ``[lo, hi)`` for the days ``start``..``end`` within ``periods``.
+
+    Returns None when nothing is filtered out, so unfiltered charts keep
+    their plain spec; an empty tuple when nothing is left.
+    """
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end) + ONE_DAY
+    if start is None and end is None and set(periods) >= set(PERIODS):
+        return None
+
+    merged = []
+    for period in PERIODS:
+        if period not in periods:
+            continue
+        lo, hi = PERIOD_SPANS[period]
+        if merged and merged[-1][1] == lo:
+            lo = merged.pop()[0]
+        merged.append((lo, hi))
+
+    clipped = []
+    for lo, hi in merged:
+        lo = start if lo is None or (start is not None and start > lo) else lo
+        hi = end if hi is None or (end is not None and end < hi) else hi
+        if lo is None or hi is None or lo < hi:
+            clipped.append((lo, hi))
+    return tuple(clipped)
+
+
+def hull(spans):
+    """The smallest single interval covering ``spans``."""
+    if not spans:
+        return None, None
+    lows, highs = [lo for lo, _ in spans], [hi for _, hi in spans]
+    return (None if None in lows else min(lows)), (None if None in highs else max(highs))
+
+
+def clip(frame, index, spans):
+    """Rows of ``frame`` (in date order, DATEs in ``index``) within ``spans``."""
+    parts = []
+    for lo, hi in spans:
+        first = 0 if lo is None else index.searchsorted(lo, side="left")
+        last = len(index) if hi is None else index.searchsorted(hi, side="left")
+        parts.append(frame.iloc[first:last])
+    if not parts:
+        return frame.iloc[0:0]
+    return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def _indexed(key, _frame):
+    frame = _frame
+    if not frame["DATE"].is_monotonic_increasing:
+        frame = freeze(frame.sort_values("DATE", kind="stable"))
+    return frame, pd.DatetimeIndex(frame["DATE"])
+
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+def _view(key, spans, _frame):
+    frame, index = _indexed(key, _frame)
+    return freeze(clip(frame, index, spans))
+
+
+def view(frame, spans, key=None):
+    """``frame`` limited to ``spans``; ``frame`` itself when ``spans`` is None.
+
+    With a ``key`` identifying the content of ``frame`` (its dataset version
+    and segment, say) the sorted index and the result are cached under it;
+    without one, e.g. for a query result, ``frame`` is sliced afresh.
+    """
+    if spans is None:
+        return frame
+    if key is None:
+        if not frame["DATE"].is_monotonic_increasing:
+            frame = frame.sort_values("DATE", kind="stable")
+        return clip(frame, pd.DatetimeIndex(frame["DATE"]), spans)
+    return _view(key, spans, frame)
@@ -1,12 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from millify import millify
-from streamlit_extras.colored_header import colored_header
-
-st.cache_data.clear()
+from fee_impact.aggregates import metric_cards
+from fee_impact.charts import Chart, render_grid
+from fee_impact.controls import sidebar
+from fee_impact.instrument import debug_panel
+from fee_impact.lazy import colored_header
+from fee_impact.profiler import profile_panel
 
 st.set_page_config(
     page_title="Uniswap Frontend Fee Impact",
@@ -42,125 +40,87 @@ div[data-testid="metric-container"] > label[data-testid="stMetricLabel"] > div {
 """
             , unsafe_allow_html=True)
 
+sidebar("The Retailer & The Whale")
+
 st.markdown(f'<h1 style="color:#434346;font-size:60px;text-align:center;">{"The Retailer & The Whale"}</h1>', unsafe_allow_html=True)
 st.info("This page juxtaposes the reaction of Retail users and Whales to the introduction and subsequent hike in Uniswap frontend fee.", icon="ℹ️")
 st.info("Retail users are users with less than 100K USD average swap volume || Whales are users with 100K USD or more average swap volume", icon="ℹ️")
 
-url9 = "https://flipsidecrypto.xyz/edit/queries/397fbf4c-9cae-4031-8481-4eb8ba0f984e"
-@st.cache_data
-def load_df9():
-    df9 = pd.read_csv('data/df9.csv')
-    return df9
-
-df9 = load_df9()
-
 ###################################
 ############ DF9 CHARTS ###########
 ###################################
 
 ################ CHART START ###################
-df9_fig1 = px.bar(df9[df9['CATEGORY'] == 'Retail User'],
-              x="DATE",
-              y="ACTIVE_USERS",
-              color="PERIOD",
-              title="Uniswap Daily Active Users [Retail Users]")
-df9_fig1.update_layout(hovermode="x unified")
+df9_fig1 = Chart("df9",
+                 segment="Retail User",
+                 y="ACTIVE_USERS",
+                 title="Uniswap Daily Active Users [Retail Users]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig2 = px.bar(df9[df9['CATEGORY'] == 'Whale'],
-              x="DATE",
-              y="ACTIVE_USERS",
-              color="PERIOD",
-              title="Uniswap Daily Active Users [Whales]")
-df9_fig2.update_layout(hovermode="x unified")
+df9_fig2 = Chart("df9",
+                 segment="Whale",
+                 y="ACTIVE_USERS",
+                 title="Uniswap Daily Active Users [Whales]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig3 = px.bar(df9[df9['CATEGORY'] == 'Retail User'],
-              x="DATE",
-              y="NUMBER_OF_SWAPS",
-              color="PERIOD",
-              title="Uniswap Daily Number of Swaps [Retail Users]")
-df9_fig3.update_layout(hovermode="x unified")
+df9_fig3 = Chart("df9",
+                 segment="Retail User",
+                 y="NUMBER_OF_SWAPS",
+                 title="Uniswap Daily Number of Swaps [Retail Users]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig4 = px.bar(df9[df9['CATEGORY'] == 'Whale'],
-              x="DATE",
-              y="NUMBER_OF_SWAPS",
-              color="PERIOD",
-              title="Uniswap Daily Number of Swaps [Whales]")
-df9_fig4.update_layout(hovermode="x unified")
+df9_fig4 = Chart("df9",
+                 segment="Whale",
+                 y="NUMBER_OF_SWAPS",
+                 title="Uniswap Daily Number of Swaps [Whales]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig5 = px.bar(df9[df9['CATEGORY'] == 'Retail User'],
-              x="DATE",
-              y="VOLUME_USD",
-              color="PERIOD",
-              title="Uniswap Daily Volume (USD) [Retail Users]")
-df9_fig5.update_layout(hovermode="x unified")
+df9_fig5 = Chart("df9",
+                 segment="Retail User",
+                 y="VOLUME_USD",
+                 title="Uniswap Daily Volume (USD) [Retail Users]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig6 = px.bar(df9[df9['CATEGORY'] == 'Whale'],
-              x="DATE",
-              y="VOLUME_USD",
-              color="PERIOD",
-              title="Uniswap Daily Volume (USD) [Whales]")
-df9_fig6.update_layout(hovermode="x unified")
+df9_fig6 = Chart("df9",
+                 segment="Whale",
+                 y="VOLUME_USD",
+                 title="Uniswap Daily Volume (USD) [Whales]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig7 = px.bar(df9[df9['CATEGORY'] == 'Retail User'],
-              x="DATE",
-              y="TXN_PER_USER",
-              color="PERIOD",
-              title="Uniswap Daily Transaction Per User [Retail Users]")
-df9_fig7.update_layout(hovermode="x unified")
+df9_fig7 = Chart("df9",
+                 segment="Retail User",
+                 y="TXN_PER_USER",
+                 title="Uniswap Daily Transaction Per User [Retail Users]")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df9_fig8 = px.bar(df9[df9['CATEGORY'] == 'Whale'],
-              x="DATE",
-              y="TXN_PER_USER",
-              color="PERIOD",
-              title="Uniswap Daily Transaction Per User [Whales]")
-df9_fig8.update_layout(hovermode="x unified")
+df9_fig8 = Chart("df9",
+                 segment="Whale",
+                 y="TXN_PER_USER",
+                 title="Uniswap Daily Transaction Per User [Whales]")
 ################### CHART END ##################
 
-col_1a, col_1b = st.columns(2)
-with col_1a:
-    st.plotly_chart(df9_fig1, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-with col_1b:
-    st.plotly_chart(df9_fig2, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-
-col_2a, col_2b = st.columns(2)
-with col_2a:
-    st.plotly_chart(df9_fig3, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-with col_2b:
-    st.plotly_chart(df9_fig4, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-
-col_3a, col_3b = st.columns(2)
-with col_3a:
-    st.plotly_chart(df9_fig5, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-with col_3b:
-    st.plotly_chart(df9_fig6, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-
-col_4a, col_4b = st.columns(2)
-with col_4a:
-    st.plotly_chart(df9_fig7, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
-with col_4b:
-    st.plotly_chart(df9_fig8, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url9}")
+render_grid([
+    (df9_fig1, df9_fig2),
+    (df9_fig3, df9_fig4),
+    (df9_fig5, df9_fig6),
+    (df9_fig7, df9_fig8),
+])
+
+###################################
+######## PERIOD AVERAGES ##########
+###################################
+
+metric_cards("df9", "ACTIVE_USERS", "Avg Daily Active Retail Users", segment="Retail User")
+metric_cards("df9", "ACTIVE_USERS", "Avg Daily Active Whales", segment="Whale")
+metric_cards("df9", "TXN_PER_USER", "Avg Transactions Per Retail User", segment="Retail User")
+metric_cards("df9", "TXN_PER_USER", "Avg Transactions Per Whale", segment="Whale")
 
 insight_1a = '<p style="font-family:sans-serif; color:#4d372c; font-size: 18px;">Comparing the reactions of retail users and whales to the frontend fee introduction reveals intriguing patterns in user behavior. Contrary to expectations, the initial fee implementation did not lead to a decline in activity. Instead, we observed an upward trend in user engagement across both user segments. This could be attributed to:</p>'
 
@@ -187,3 +147,6 @@ colored_header(
     description="",
     color_name="gray-70",
 )
+
+debug_panel()
+profile_panel()
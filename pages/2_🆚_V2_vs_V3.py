@@ -1,13 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from millify import millify
-from streamlit_extras.colored_header import colored_header
-from urllib.request import Request, urlopen
-
-st.cache_data.clear()
+from fee_impact.aggregates import metric_cards
+from fee_impact.charts import Chart, render_grid
+from fee_impact.controls import sidebar
+from fee_impact.instrument import debug_panel
+from fee_impact.lazy import colored_header
+from fee_impact.profiler import profile_panel
 
 st.set_page_config(
     page_title="Uniswap Frontend Fee Impact",
@@ -43,123 +40,85 @@ div[data-testid="metric-container"] > label[data-testid="stMetricLabel"] > div {
 """
             , unsafe_allow_html=True)
 
+sidebar("V2 vs V3")
+
 st.markdown(f'<h1 style="color:#434346;font-size:60px;text-align:center;">{"V2 vs. V3"}</h1>', unsafe_allow_html=True)
 st.info("This page examines how different versions of Uniswap: V2 & V3, reacted to the introduction and subsequent hike in Uniswap frontend fee.", icon="ℹ️")
 
  
-url2 = "https://flipsidecrypto.xyz/edit/queries/4ec52f72-2f3e-4c4d-ab4c-4438065d68fc"
-@st.cache_data
-def load_df2():
-    df2 = pd.read_csv('data/df2.csv')
-    return df2
-
-df2 = load_df2()
 
 ################ CHART START ###################
-df2_fig1 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v2'],
-              x="DATE",
-              y="VOLUME_USD",
-              color="PERIOD",
-              title="Uniswap V2 Daily Volume (USD)")
-df2_fig1.update_layout(hovermode="x unified")
+df2_fig1 = Chart("df2",
+                 segment="uniswap-v2",
+                 y="VOLUME_USD",
+                 title="Uniswap V2 Daily Volume (USD)")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig2 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v3'],
-              x="DATE",
-              y="VOLUME_USD",
-              color="PERIOD",
-              title="Uniswap V3 Daily Volume (USD)")
-df2_fig2.update_layout(hovermode="x unified")
+df2_fig2 = Chart("df2",
+                 segment="uniswap-v3",
+                 y="VOLUME_USD",
+                 title="Uniswap V3 Daily Volume (USD)")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig3 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v2'],
-              x="DATE",
-              y="SWAPS",
-              color="PERIOD",
-              title="Uniswap V2 Daily Swap Count")
-df2_fig3.update_layout(hovermode="x unified")
+df2_fig3 = Chart("df2",
+                 segment="uniswap-v2",
+                 y="SWAPS",
+                 title="Uniswap V2 Daily Swap Count")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig4 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v3'],
-              x="DATE",
-              y="SWAPS",
-              color="PERIOD",
-              title="Uniswap V3 Daily Swap Count")
-df2_fig4.update_layout(hovermode="x unified")
+df2_fig4 = Chart("df2",
+                 segment="uniswap-v3",
+                 y="SWAPS",
+                 title="Uniswap V3 Daily Swap Count")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig5 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v2'],
-              x="DATE",
-              y="UNIQUE_SWAPPERS",
-              color="PERIOD",
-              title="Uniswap V2 Daily Unique Swappers")
-df2_fig5.update_layout(hovermode="x unified")
+df2_fig5 = Chart("df2",
+                 segment="uniswap-v2",
+                 y="UNIQUE_SWAPPERS",
+                 title="Uniswap V2 Daily Unique Swappers")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig6 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v3'],
-              x="DATE",
-              y="UNIQUE_SWAPPERS",
-              color="PERIOD",
-              title="Uniswap V3 Daily Unique Swappers")
-df2_fig6.update_layout(hovermode="x unified")
+df2_fig6 = Chart("df2",
+                 segment="uniswap-v3",
+                 y="UNIQUE_SWAPPERS",
+                 title="Uniswap V3 Daily Unique Swappers")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig7 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v2'],
-              x="DATE",
-              y="ACTIVE_POOLS",
-              color="PERIOD",
-              title="Uniswap V2 Daily Active Pools")
-df2_fig7.update_layout(hovermode="x unified")
+df2_fig7 = Chart("df2",
+                 segment="uniswap-v2",
+                 y="ACTIVE_POOLS",
+                 title="Uniswap V2 Daily Active Pools")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df2_fig8 = px.bar(df2[df2['PLATFORM'] == 'uniswap-v3'],
-              x="DATE",
-              y="ACTIVE_POOLS",
-              color="PERIOD",
-              title="Uniswap V3 Daily Active Pools")
-df2_fig8.update_layout(hovermode="x unified")
+df2_fig8 = Chart("df2",
+                 segment="uniswap-v3",
+                 y="ACTIVE_POOLS",
+                 title="Uniswap V3 Daily Active Pools")
 ################### CHART END ##################
 
 
-col_1a, col_1b = st.columns(2)
-with col_1a:
-    st.plotly_chart(df2_fig1, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-with col_1b:
-    st.plotly_chart(df2_fig2, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-
-col_2a, col_2b = st.columns(2)
-with col_2a:
-    st.plotly_chart(df2_fig3, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-with col_2b:
-    st.plotly_chart(df2_fig4, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-
-col_3a, col_3b = st.columns(2)
-with col_3a:
-    st.plotly_chart(df2_fig5, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-with col_3b:
-    st.plotly_chart(df2_fig6, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-
-col_4a, col_4b = st.columns(2)
-with col_4a:
-    st.plotly_chart(df2_fig7, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
-with col_4b:
-    st.plotly_chart(df2_fig8, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url2}")
+render_grid([
+    (df2_fig1, df2_fig2),
+    (df2_fig3, df2_fig4),
+    (df2_fig5, df2_fig6),
+    (df2_fig7, df2_fig8),
+])
 
+###################################
+######## PERIOD AVERAGES ##########
+###################################
+
+metric_cards("df2", "SWAPS", "Avg Daily V2 Swap Count", segment="uniswap-v2")
+metric_cards("df2", "SWAPS", "Avg Daily V3 Swap Count", segment="uniswap-v3")
+metric_cards("df2", "ACTIVE_POOLS", "Avg Daily V2 Active Pools", segment="uniswap-v2")
+metric_cards("df2", "ACTIVE_POOLS", "Avg Daily V3 Active Pools", segment="uniswap-v3")
 
 insight_1a = '<p style="font-family:sans-serif; color:#4d372c; font-size: 18px;">The introduction of the frontend fee initially saw an uptrend in daily volume for both Uniswap V2 and V3. However, the fee hike to 0.25% triggered a decline in volume across both versions. This initial reaction aligns with expected user behavior when faced with increased costs.</p>'
 
@@ -181,3 +140,6 @@ colored_header(
     description="",
     color_name="gray-70",
 )
+
+debug_panel()
+profile_panel()
@@ -1,10 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from millify import millify
-from streamlit_extras.colored_header import colored_header
+from fee_impact.attribution import POOLED, did_table, event_figure
+from fee_impact.controls import sidebar
+from fee_impact.effects import CHANGES, WINDOW, ranking
+from fee_impact.lazy import colored_header
+from fee_impact.profiler import profile_panel
 
 st.set_page_config(
     page_title="Uniswap Frontend Fee Impact",
@@ -40,6 +39,8 @@ div[data-testid="metric-container"] > label[data-testid="stMetricLabel"] > div {
 """
             , unsafe_allow_html=True)
 
+sidebar("Conclusion")
+
 st.markdown(f'<h1 style="color:#434346;font-size:60px;text-align:center;">{"Conclusion"}</h1>', unsafe_allow_html=True)
 st.info("This page encapsulates the essential takeaways from our analysis.", icon="ℹ️")
 
@@ -52,3 +53,65 @@ insight_1c = '<ul style="font-family:sans-serif; color:#4d372c; font-size: 20px;
 st.markdown(insight_1a, unsafe_allow_html=True)
 st.markdown(insight_1b, unsafe_allow_html=True)
 st.markdown(insight_1c, unsafe_allow_html=True)
+
+###################################
+####### WHICH SEGMENT REACTED #####
+###################################
+
+colored_header(
+    label="Which segment reacted most?",
+    description="Daily averages before and after each fee change, for every metric of every chain, Uniswap version and user class",
+    color_name="gray-70",
+)
+
+change_col, window_col, metric_col = st.columns(3)
+change = change_col.radio("Fee change to", CHANGES, horizontal=True, key="change")
+window = window_col.select_slider("Days compared on each side", [7, 14, 30, 60, 90, "whole period"],
+                                  value=WINDOW)
+window = None if window == "whole period" else window
+ranked = ranking(change, window=window)
+metric = metric_col.selectbox("Metric", ["all"] + sorted(ranked["METRIC"].unique()), key="metric")
+if metric != "all":
+    ranked = ranked[ranked["METRIC"] == metric]
+
+st.dataframe(
+    ranked.drop(columns=["CHANGE", "T"]),
+    hide_index=True,
+    column_config={
+        "MEAN_BEFORE": st.column_config.NumberColumn("Before", format="compact"),
+        "MEAN_AFTER": st.column_config.NumberColumn("After", format="compact"),
+        "PCT_CHANGE": st.column_config.NumberColumn("Change", format="percent"),
+        "ELASTICITY": st.column_config.NumberColumn("Elasticity", format="%.2f",
+                                                    help="Arc elasticity of the daily average with respect to the fee"),
+        "P_VALUE": st.column_config.NumberColumn("p-value", format="%.4f",
+                                                 help="Welch's t-test on log daily values"),
+    },
+)
+
+###################################
+###### UNISWAP VS OTHER DEXS ######
+###################################
+
+colored_header(
+    label="Uniswap vs other DEXs around the 0.25% hike",
+    description="Difference-in-differences of Uniswap's daily activity against the other DEXs, 6 weeks on each side of the hike, with 95% block-bootstrap intervals",
+    color_name="gray-70",
+)
+
+with st.spinner("Resampling..."):
+    event_figure().plot()
+    did = did_table()
+
+control = st.selectbox("Control group", sorted(did["CONTROL"].unique(), key=lambda c: (c != POOLED, c)))
+st.dataframe(
+    did[did["CONTROL"] == control].drop(columns=["DATASET", "CONTROL", "ESTIMATE"]),
+    hide_index=True,
+    column_config={
+        "EFFECT": st.column_config.NumberColumn("Effect on Uniswap", format="percent"),
+        "LOW": st.column_config.NumberColumn("95% low", format="percent"),
+        "HIGH": st.column_config.NumberColumn("95% high", format="percent"),
+        "P_VALUE": st.column_config.NumberColumn("p-value", format="%.3f"),
+    },
+)
+
+profile_panel()
@@ -0,0 +1,14 @@
+import pytest
+
+from fee_impact import registry, synthetic
+
+DAYS = 40
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A small synthetic copy of the exports that the registry reads instead of data/."""
+    folder = tmp_path / "data"
+    synthetic.write(synthetic.generate(days=DAYS, chains=3, dexes=5), folder)
+    monkeypatch.setattr(registry, "DATA_DIR", str(folder))
+    return folder
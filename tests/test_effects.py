@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fee_impact.effects import compute, t_pvalue
+
+
+def long_frame(before, after):
+    """One series' days either side of the 0.15% fee, in the shape of ``stacked``."""
+    values = before + after
+    return pd.DataFrame({
+        "DATASET": "df1",
+        "SEGMENT": "All",
+        "METRIC": "SWAPS",
+        "DATE": pd.date_range(pd.Timestamp("2023-10-17") - pd.Timedelta(days=len(before)),
+                              periods=len(values)),
+        "PERIOD": [0] * len(before) + [1] * len(after),
+        "VALUE": values,
+    })
+
+
+def test_compute_measures_the_fee_introduction():
+    out = compute(long_frame([9.0, 11.0, 9.0, 11.0], [14.0, np.nan, 16.0, 14.0, 16.0]), window=None)
+    row = out[out["CHANGE"] == "0.15% fee"].iloc[0]
+
+    # the missing day is not counted
+    assert (row["N_BEFORE"], row["N_AFTER"]) == (4, 4)
+    assert (row["MEAN_BEFORE"], row["MEAN_AFTER"]) == (10.0, 15.0)
+    assert row["PCT_CHANGE"] == pytest.approx(0.5)
+    # arc elasticity: (5 / 12.5) / (0.15 / 0.075)
+    assert row["ELASTICITY"] == pytest.approx(0.2)
+    assert row["T"] > 0 and row["P_VALUE"] < 0.05
+
+
+def test_compute_leaves_a_change_with_one_side_empty():
+    out = compute(long_frame([9.0, 11.0], [14.0, 16.0]), window=None)
+    row = out[out["CHANGE"] == "0.25% fee"].iloc[0]
+
+    assert row["N_BEFORE"] == 2
+    assert np.isnan(row["N_AFTER"]) and np.isnan(row["PCT_CHANGE"])
+
+
+@pytest.mark.parametrize("t, dof, p", [(2.086, 20, 0.05), (-2.086, 20, 0.05),
+                                       (2.845, 20, 0.01), (1.96, 1e6, 0.05), (0.0, 5, 1.0)])
+def test_t_pvalue_matches_student_t_tables(t, dof, p):
+    assert t_pvalue(np.array([t]), np.array([dof]))[0] == pytest.approx(p, abs=1e-3)
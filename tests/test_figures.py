@@ -0,0 +1,50 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fee_impact.figures import LRUCache
+
+
+def test_concurrent_misses_build_once():
+    cache = LRUCache(4)
+    builds = []
+
+    def build():
+        builds.append(threading.get_ident())
+        time.sleep(0.01)
+        return "figure"
+
+    for _ in range(20):
+        cache.clear()
+        builds.clear()
+        with ThreadPoolExecutor(16) as pool:
+            values = list(pool.map(lambda _: cache.get_or_build("key", build), range(64)))
+        assert values == ["figure"] * 64
+        assert len(builds) == 1
+
+
+def test_failed_build_is_retried():
+    cache = LRUCache(4)
+
+    def fail():
+        raise RuntimeError("no data")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_build("key", fail)
+
+    assert cache.get_or_build("key", lambda: "figure") == "figure"
+    assert cache._building == {}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(2)
+    cache.get_or_build("a", lambda: 1)
+    cache.get_or_build("b", lambda: 2)
+    cache.get_or_build("a", lambda: 1)
+
+    cache.get_or_build("c", lambda: 3)
+
+    assert len(cache) == 2
+    assert cache.get_or_build("b", lambda: "rebuilt") == "rebuilt"
@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+
+from fee_impact import ingest, store, synthetic
+from fee_impact.registry import get_dataset
+
+from conftest import DAYS
+
+# overlaps the stored history by OVERLAP days, with different values, and adds NEW days
+OVERLAP = 5
+NEW = 5
+
+
+@pytest.fixture
+def drop_dir(tmp_path):
+    frames = synthetic.generate(days=DAYS + NEW, chains=3, dexes=5, seed=1)
+    first = frames["df1"]["DATE"].iloc[DAYS - OVERLAP]
+    folder = tmp_path / "drop"
+    synthetic.write({name: df[df["DATE"] >= first] for name, df in frames.items()}, folder)
+    return folder
+
+
+def stored(name):
+    ds = get_dataset(name)
+    return store.read_source_csv(ds.path, ds.schema)
+
+
+def read_drop(drop_dir, name):
+    return store.read_source_csv(str(drop_dir / f"{name}.csv"), get_dataset(name).schema)
+
+
+def canonical(df, name):
+    """``df`` in key order with plain values, so frames built differently compare equal."""
+    key = ingest.natural_key(get_dataset(name))
+    df = df.astype({col: str for col in df.columns if df[col].dtype == "category"})
+    return df.sort_values(key, kind="stable").reset_index(drop=True)
+
+
+def merged(before, drop, name):
+    key = ingest.natural_key(get_dataset(name))
+    return pd.concat([canonical(before, name), canonical(drop, name)]).drop_duplicates(key, keep="last")
+
+
+@pytest.mark.parametrize("name", ["df1", "df3", "df7"])
+def test_overlapping_drop_is_merged(data_dir, drop_dir, name):
+    before = stored(name)
+
+    refresh = ingest.ingest(name, drop_dir)
+
+    assert refresh.dates == OVERLAP + NEW
+    pd.testing.assert_frame_equal(canonical(stored(name), name),
+                                  canonical(merged(before, read_drop(drop_dir, name), name), name))
+
+
+def test_same_drop_twice_is_idempotent(data_dir, drop_dir):
+    path = get_dataset("df3").path
+    first = ingest.ingest("df3", drop_dir)
+    with open(path, "rb") as f:
+        written = f.read()
+
+    again = ingest.ingest("df3", drop_dir)
+
+    assert (again.dates, again.rows, again.version) == (0, 0, first.version)
+    with open(path, "rb") as f:
+        assert f.read() == written
+    assert store.file_version(path) == f"v{first.version}"
+
+
+def test_file_is_truncated_at_the_first_changed_date(data_dir, drop_dir):
+    path = get_dataset("df3").path
+    with open(path, "rb") as f:
+        original = f.read()
+    first_changed = read_drop(drop_dir, "df3")["DATE"].min().strftime(ingest.DATE_TEXT)
+    keep = original.index(first_changed.encode())
+
+    refresh = ingest.ingest("df3", drop_dir)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:keep] == original[:keep]
+    assert len(data) == keep + refresh.bytes
+
+
+def test_drop_is_deduplicated_on_the_natural_key(data_dir, drop_dir):
+    drop = pd.read_csv(drop_dir / "df3.csv")
+    twice = drop.iloc[[-1]].assign(VOLUME_USD=123.0)
+    pd.concat([drop, twice]).to_csv(drop_dir / "df3.csv", index=False)
+
+    ingest.ingest("df3", drop_dir)
+
+    df = stored("df3")
+    last = df[(df["DATE"] == df["DATE"].max()) & (df["CHAIN"] == twice["CHAIN"].iloc[0])]
+    assert last["VOLUME_USD"].tolist() == [123.0]
+
+
+def test_stored_rows_missing_from_the_drop_are_kept(data_dir, drop_dir):
+    before = stored("df3")
+    drop = pd.read_csv(drop_dir / "df3.csv")
+    gone = drop["CHAIN"].iloc[0]
+    drop[drop["CHAIN"] != gone].to_csv(drop_dir / "df3.csv", index=False)
+
+    ingest.ingest("df3", drop_dir)
+
+    df = stored("df3")
+    overlap = before[before["DATE"] >= before["DATE"].max() - pd.Timedelta(days=OVERLAP - 1)]
+    kept = df[(df["CHAIN"] == gone) & df["DATE"].isin(overlap["DATE"])]
+    pd.testing.assert_frame_equal(canonical(kept, "df3"),
+                                  canonical(overlap[overlap["CHAIN"] == gone], "df3"))
+
+
+def test_columnar_copy_follows_the_csv(data_dir, drop_dir):
+    ds = get_dataset("df3")
+    store.convert(ds.path, ds.schema)
+
+    ingest.ingest("df3", drop_dir)
+
+    columnar = store.read_columnar(ds.path, ds.schema)
+    assert columnar is not None
+    pd.testing.assert_frame_equal(canonical(columnar, "df3"), canonical(stored("df3"), "df3"))
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from fee_impact import query
+from fee_impact.registry import DATASETS, get_dataset
+
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def duckdb_backend(monkeypatch):
+    monkeypatch.setattr(query, "BACKEND", "duckdb")
+
+
+@pytest.fixture
+def export_quirks(data_dir):
+    """df3 as Flipside writes it: ``null`` values and a stray BOM as the last line."""
+    path = get_dataset("df3").path
+    df = pd.read_csv(path, dtype=str)
+    df.loc[[3, 10], "VOLUME_USD"] = "null"
+    df.loc[10, "SWAPS"] = "null"
+    df.to_csv(path, index=False)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("﻿\n")
+    return data_dir
+
+
+def pandas_rows(name, where=None, start=None, end=None):
+    where = {col: query._values(value) for col, value in (where or {}).items()}
+    return query._select_pandas(name, list(get_dataset(name).columns), where, start, end)
+
+
+def assert_same_rows(left, right, name):
+    # DuckDB orders rows within a date by the partition keys, pandas keeps the file's order
+    key = ["DATE", *get_dataset(name).partition_keys]
+    assert len(left) == len(right)
+    pd.testing.assert_frame_equal(left.sort_values(key, ignore_index=True),
+                                  right.sort_values(key, ignore_index=True))
+
+
+@pytest.mark.parametrize("name", sorted(DATASETS))
+def test_csv_scan_matches_pandas(data_dir, duckdb_backend, name):
+    assert_same_rows(query.select(name), pandas_rows(name), name)
+
+
+def test_csv_scan_keeps_rows_with_nulls(export_quirks, duckdb_backend):
+    df = query.select("df3")
+
+    assert_same_rows(df, pandas_rows("df3"), "df3")
+    assert df["VOLUME_USD"].isna().sum() == 2
+    assert df["SWAPS"].isna().sum() == 1
+
+
+def test_filters_match_pandas(export_quirks, duckdb_backend):
+    chain = pandas_rows("df3")["CHAIN"].iloc[0]
+    where = {"CHAIN": chain, "PERIOD": ["no fee"]}
+
+    df = query.select("df3", where=where, start="2023-06-05", end="2023-06-20")
+
+    assert_same_rows(df, pandas_rows("df3", where, "2023-06-05", "2023-06-20"), "df3")
+    assert len(df) == 15
+
+
+def test_missing_duckdb_is_reported_once(duckdb_backend, monkeypatch, caplog):
+    monkeypatch.setattr(query.importlib.util, "find_spec", lambda name: None)
+    query._installed.cache_clear()
+    try:
+        assert not any(query.enabled() for _ in range(3))
+    finally:
+        query._installed.cache_clear()
+
+    assert [r.levelname for r in caplog.records if r.name == query.__name__] == ["WARNING"]
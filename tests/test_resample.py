@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fee_impact.resample import bucket, downsample, lttb
+
+
+@pytest.mark.parametrize("size, n", [(1000, 50), (101, 3), (10, 9)])
+def test_lttb_keeps_endpoints_in_order(size, n):
+    rng = np.random.default_rng(0)
+    x = np.arange(size) * 10.0
+    y = rng.normal(size=size).cumsum()
+
+    keep = lttb(x, y, n)
+
+    assert len(keep) == n
+    assert keep[0] == 0 and keep[-1] == size - 1
+    assert (np.diff(keep) > 0).all()
+
+
+def test_lttb_keeps_a_spike():
+    y = np.zeros(1000)
+    y[437] = 100.0
+
+    assert 437 in lttb(np.arange(1000), y, 20)
+
+
+def test_lttb_leaves_short_series_alone():
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_bucket_averages_per_observed_day_across_a_fee_change():
+    # the 0.15% fee starts on Tuesday 2023-10-17, splitting that week 1 / 6
+    df = pd.DataFrame({
+        "DATE": pd.date_range("2023-10-16", "2023-10-22"),
+        "PERIOD": ["no fee"] + ["0.15% fee"] * 6,
+        "VOLUME_USD": [14.0] + [7.0] * 6,
+    })
+
+    out = bucket(df, "DATE", "VOLUME_USD", ["PERIOD"], "weekly")
+
+    assert out["DATE"].tolist() == [pd.Timestamp("2023-10-16")] * 2
+    by_period = dict(zip(out["PERIOD"], out["VOLUME_USD"]))
+    # each period's sum over the week's 7 observed days: stacked, they make the daily mean
+    assert by_period == {"no fee": pytest.approx(2.0), "0.15% fee": pytest.approx(6.0)}
+    assert sum(by_period.values()) == pytest.approx(df["VOLUME_USD"].mean())
+
+
+def test_bucket_counts_only_observed_days():
+    df = pd.DataFrame({"DATE": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-20"]),
+                       "SWAPS": [3.0, 5.0, 10.0]})
+
+    out = bucket(df, "DATE", "SWAPS", [], "monthly")
+
+    assert out["SWAPS"].tolist() == [pytest.approx(6.0)]
+
+
+def test_daily_bucket_is_a_no_op():
+    df = pd.DataFrame({"DATE": pd.date_range("2024-01-01", periods=3), "SWAPS": [1, 2, 3]})
+
+    assert bucket(df, "DATE", "SWAPS", [], "daily") is df
+
+
+def test_downsample_caps_each_trace():
+    dates = pd.date_range("2023-01-01", periods=900)
+    df = pd.concat([pd.DataFrame({"DATE": dates, "DEX": dex, "SHARE": np.sin(np.arange(900) / k)})
+                    for dex, k in [("uniswap", 7.0), ("curve", 13.0)]] +
+                   [pd.DataFrame({"DATE": dates[:40], "DEX": "tiny", "SHARE": 1.0})])
+
+    out = downsample(df, "DATE", "SHARE", ["DEX"], 100)
+
+    counts = out.groupby("DEX")["DATE"].count()
+    assert counts.to_dict() == {"curve": 100, "tiny": 40, "uniswap": 100}
+    assert out["DATE"].is_monotonic_increasing
+    for dex in ("uniswap", "curve"):
+        trace = out[out["DEX"] == dex]
+        assert trace["DATE"].iloc[0] == dates[0] and trace["DATE"].iloc[-1] == dates[-1]
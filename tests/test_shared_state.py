@@ -0,0 +1,117 @@
+"""Sessions must not change the data and figures every session shares."""
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from fee_impact import cache
+from fee_impact.figures import FIGURES
+from fee_impact.partitions import partition_index
+from fee_impact.registry import DATASETS, load_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = [os.path.join(ROOT, "🏠_Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def frame_digest(df):
+    digest = hashlib.sha1(repr([df.columns.tolist(), df.dtypes.astype(str).tolist()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def shared_state():
+    """Digest of every cached dataset, partition index and figure."""
+    state = {name: frame_digest(load_dataset(name)) for name in DATASETS}
+    for name, ds in DATASETS.items():
+        if ds.partition_keys:
+            state[f"{name} partitions"] = frame_digest(partition_index(name).frame)
+    with FIGURES._lock:
+        entries = list(FIGURES._items.items())
+    for key, entry in entries:
+        state[repr(key)] = hashlib.sha1(entry._figure.to_json().encode()).hexdigest()
+    return state
+
+
+def changed(before, after):
+    return sorted(key for key in before if key in after and before[key] != after[key])
+
+
+@pytest.fixture
+def fresh_caches():
+    yield
+    cache._load.clear()
+    FIGURES.clear()
+
+
+def run(page):
+    at = AppTest.from_file(page, default_timeout=300)
+    at.run()
+    assert not at.exception, at.exception[0].message
+    return at
+
+
+def test_sessions_leave_shared_state_unchanged(fresh_caches):
+    for page in PAGES:
+        run(page)
+    before = shared_state()
+
+    for page in PAGES:
+        at = run(page)
+        for box in at.selectbox:
+            for option in box.options:
+                box.set_value(option)
+                at.run()
+                assert not at.exception, at.exception[0].message
+    at = run(PAGES[0])
+    at.sidebar.multiselect[0].set_value(["0.25% fee"])
+    at.sidebar.radio[0].set_value("weekly")
+    at.run()
+
+    assert changed(before, shared_state()) == []
+
+
+def test_a_session_changing_its_frames_leaves_the_shared_ones_unchanged(fresh_caches):
+    before = shared_state()
+
+    df = load_dataset("df1")
+    df["SWAPS"] = 0
+    df.drop(columns=["VOLUME_USD"], inplace=True)
+    partition_index("df3").frame.drop(columns=["SWAPS"], inplace=True)
+
+    assert "VOLUME_USD" not in df
+    assert changed(before, shared_state()) == []
+
+
+@pytest.mark.parametrize("name", ["df1", "df3", "df7"])
+def test_writes_never_reach_a_shared_frame(name):
+    before = frame_digest(load_dataset(name))
+
+    df = load_dataset(name)
+    for i in range(df.shape[1]):
+        # copy-on-write gives the session's frame its own values first
+        df.iloc[0, i] = df.iloc[1, i]
+    assert frame_digest(load_dataset(name)) == before
+
+    df = load_dataset(name)
+    for write in (lambda: df[df.columns[-1]].to_numpy().__setitem__(0, 0),
+                  lambda: np.asarray(df[df.columns[-1]]).__setitem__(0, 0)):
+        with pytest.raises(ValueError):
+            write()
+    assert frame_digest(load_dataset(name)) == before
+
+
+def test_figures_are_handed_out_as_copies(fresh_caches):
+    run(PAGES[0])
+    key, entry = next(iter(FIGURES._items.items()))
+    spec = entry._figure.to_json()
+
+    fig = entry.figure
+    fig.update_layout(title="changed")
+    fig.data[0].name = "changed"
+
+    assert entry._figure.to_json() == spec
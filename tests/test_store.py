@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from fee_impact import store
+from fee_impact.registry import get_dataset
+
+SCHEMA = get_dataset("df1").schema     # DATE, PERIOD, VOLUME_USD and three counts
+
+EXPORT = """\
+DATE,PERIOD,VOLUME_USD,SWAPS,UNIQUE_SWAPPERS,ACTIVE_POOLS
+2023-06-01 00:00:00.000,no fee,25160473.42,74019,31534,521
+2023-06-02 00:00:00.000,no fee,null,null,30221,517
+2023-06-03 00:00:00.000,no fee,23110873.05,70102,29875,509
+﻿
+"""
+
+
+def write_export(tmp_path, text=EXPORT):
+    path = tmp_path / "df1.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_null_count_loads_as_nullable(tmp_path):
+    df = store.read_source_csv(write_export(tmp_path), SCHEMA)
+
+    assert len(df) == 3
+    assert df["SWAPS"].dtype == "Int32"
+    assert df["SWAPS"].isna().tolist() == [False, True, False]
+    assert pd.isna(df.loc[1, "VOLUME_USD"])
+    # counts without a missing value keep the compact dtype
+    assert df["UNIQUE_SWAPPERS"].dtype == "int32"
+    assert df["ACTIVE_POOLS"].dtype == "int32"
+
+
+def test_null_count_survives_the_columnar_copy(tmp_path):
+    path = write_export(tmp_path)
+    store.convert(path, SCHEMA)
+
+    df = store.read_columnar(path, SCHEMA)
+
+    pd.testing.assert_frame_equal(df, store.read_source_csv(path, SCHEMA))
+
+
+def test_clean_export_keeps_int32(tmp_path):
+    text = "\n".join(line for line in EXPORT.splitlines() if "null" not in line) + "\n"
+
+    df = store.read_source_csv(write_export(tmp_path, text), SCHEMA)
+
+    assert (df[["SWAPS", "UNIQUE_SWAPPERS", "ACTIVE_POOLS"]].dtypes == "int32").all()
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_unknown_category_is_rejected(tmp_path):
+    text = EXPORT.replace("2023-06-03 00:00:00.000,no fee", "2023-06-03 00:00:00.000,1% fee")
+
+    with pytest.raises(ValueError, match="PERIOD"):
+        store.read_source_csv(write_export(tmp_path, text), SCHEMA)
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from fee_impact import window
+from fee_impact.registry import DATASETS, get_dataset, load_dataset
+
+
+def test_span_matches_the_loaded_data(data_dir):
+    with open(get_dataset("df3").path, "a", encoding="utf-8") as f:
+        f.write("﻿\n")       # the junk last line of a real export
+
+    dates = [load_dataset(name)["DATE"] for name in DATASETS]
+
+    assert window.span() == (min(d.min() for d in dates), max(d.max() for d in dates))
+
+
+def test_span_follows_a_replaced_file(data_dir):
+    path = get_dataset("df1").path
+    first, last = window.span()
+    df = pd.read_csv(path, dtype=str)
+    row = df.iloc[[-1]].assign(DATE=(last + pd.Timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S.000"))
+    pd.concat([df, row]).to_csv(path, index=False)
+
+    assert window.span() == (first, last + pd.Timedelta(days=1))
+
+
+def test_edge_dates_read_only_the_ends(data_dir):
+    df = load_dataset("df7")
+
+    assert window.edge_dates(get_dataset("df7").path) == (df["DATE"].min(), df["DATE"].max())
+
+
+def test_view_matches_a_mask(data_dir):
+    df = load_dataset("df3")
+    spans = window.intervals("2023-06-05", "2023-07-01", ["no fee", "0.25% fee"])
+
+    got = window.view(df, spans, key=("df3", "test"))
+
+    keep = (df["DATE"] >= "2023-06-05") & (df["DATE"] < "2023-07-02")
+    pd.testing.assert_frame_equal(got, df[keep])
+
+
+def test_intervals():
+    assert window.intervals() is None
+    assert window.intervals(periods=[]) == ()
+    assert window.intervals(periods=["0.15% fee"]) == (
+        (pd.Timestamp("2023-10-17"), pd.Timestamp("2024-04-15")),)
+    assert window.intervals("2024-04-01", "2024-04-30", ["no fee", "0.25% fee"]) == (
+        (pd.Timestamp("2024-04-15"), pd.Timestamp("2024-05-01")),)
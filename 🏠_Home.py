@@ -1,12 +1,13 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from millify import millify
-from streamlit_extras.colored_header import colored_header
+from dataclasses import replace
 
-st.cache_data.clear()
+import streamlit as st
+from fee_impact.aggregates import metric_cards
+from fee_impact.charts import Chart, render, render_grid
+from fee_impact.controls import sidebar
+from fee_impact.instrument import debug_panel
+from fee_impact.lazy import colored_header
+from fee_impact.profiler import profile_panel
+from fee_impact.share import ALWAYS_SHOWN, OTHER, dexes
 
 st.set_page_config(
     page_title="Uniswap Frontend Fee Impact",
@@ -42,6 +43,8 @@ div[data-testid="metric-container"] > label[data-testid="stMetricLabel"] > div {
 """
             , unsafe_allow_html=True)
 
+sidebar("Home")
+
 text_1 = '<p style="font-family:sans-serif; color:#4d372c; font-size: 20px;">DeFi platforms have revolutionized the way users interact with financial services, offering unprecedented access and flexibility. Uniswap, as a leading decentralized exchange (DEX), has been at the forefront of this innovation. However, the DeFi landscape is constantly evolving, and platforms must adapt to maintain their competitive edge while ensuring sustainability.</p>'
 
 text_2 = '<p style="font-family:sans-serif; color:#4d372c; font-size: 20px;">In October 2023, Uniswap Labs introduced a significant change to its fee structure, implementing a 0.15% fee for users of its frontend interface. This fee was further increased to 0.25% in April 2024. This analysis aims to explore the ramifications of these fee changes on Uniswap\'s ecosystem. We will investigate how the introduction and subsequent increase of fees have affected Uniswap\'s overall trading volume, user base, and swap activity. Furthermore, we\'ll examine whether these changes have led to shifts in user preferences, potentially driving them towards alternative platforms.</p>'
@@ -54,97 +57,32 @@ st.markdown(text_1, unsafe_allow_html=True)
 st.markdown(text_2, unsafe_allow_html=True)
 st.markdown(text_3, unsafe_allow_html=True)
 
-###################################
-########## CACHE DATASETS #########
-###################################
-
-url1 = "https://flipsidecrypto.xyz/edit/queries/5ef84c36-29a4-4993-a322-7c22d7248272"
-@st.cache_data
-def load_df1():
-    df1 = pd.read_csv('data/df1.csv')
-    return df1
-
-url4 = "https://flipsidecrypto.xyz/edit/queries/73f03b19-9e76-41e9-9095-61abf5dfc55f"
-@st.cache_data
-def load_df4():
-    df4 = pd.read_csv('data/df4.csv')
-    return df4
-
-url6 = "https://flipsidecrypto.xyz/edit/queries/3e0f08b7-f532-41aa-9f85-616264f5172a"
-@st.cache_data
-def load_df6():
-    df6 = pd.read_csv('data/df6.csv')
-    return df6
-
-url7 = "https://flipsidecrypto.xyz/edit/queries/2e70e580-47a4-452e-9086-e6e60b39ffa2"
-@st.cache_data
-def load_df7():
-    df7 = pd.read_csv('data/df7.csv')
-    return df7
-
-url8 = "https://flipsidecrypto.xyz/edit/queries/2a8af4da-70da-4079-b8d4-96ad90e017cb"
-@st.cache_data
-def load_df8():
-    df8 = pd.read_csv('data/df8.csv')
-    return df8
-
-url10 = "https://flipsidecrypto.xyz/edit/queries/a1bce87c-9ecc-4b46-a289-bccdec9d4791"
-@st.cache_data
-def load_df10():
-    df10 = pd.read_csv('data/df10.csv')
-    return df10
-
-    
-###################################
-########## LOAD DATASETS ##########
-###################################
-
-df1 = load_df1()
-df4 = load_df4()
-df6 = load_df6()
-df7 = load_df7()
-df8 = load_df8()
-df10 = load_df10()
-
-
 ###################################
 ########### DF1 CHARTS ############
 ###################################
 
 ################ CHART START ###################
-df1_fig1 = px.bar(df1,
-              x="DATE",
-              y="VOLUME_USD",
-              color="PERIOD",
-              title="Uniswap Daily Volume (USD)")
-df1_fig1.update_layout(hovermode="x unified")
+df1_fig1 = Chart("df1",
+                 y="VOLUME_USD",
+                 title="Uniswap Daily Volume (USD)")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df1_fig2 = px.bar(df1,
-              x="DATE",
-              y="UNIQUE_SWAPPERS",
-              color="PERIOD",
-              title="Uniswap Daily Unique Swappers")
-df1_fig2.update_layout(hovermode="x unified")
+df1_fig2 = Chart("df1",
+                 y="UNIQUE_SWAPPERS",
+                 title="Uniswap Daily Unique Swappers")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df1_fig3 = px.bar(df1,
-              x="DATE",
-              y="SWAPS",
-              color="PERIOD",
-              title="Uniswap Daily Swap Count")
-df1_fig3.update_layout(hovermode="x unified")
+df1_fig3 = Chart("df1",
+                 y="SWAPS",
+                 title="Uniswap Daily Swap Count")
 ################### CHART END ##################
 
 ################ CHART START ###################
-df1_fig4 = px.bar(df1,
-              x="DATE",
-              y="ACTIVE_POOLS",
-              color="PERIOD",
-              title="Uniswap Daily Active Pools")
-df1_fig4.update_layout(hovermode="x unified")
+df1_fig4 = Chart("df1",
+                 y="ACTIVE_POOLS",
+                 title="Uniswap Daily Active Pools")
 ################### CHART END ##################
 
 ###################################
@@ -152,12 +90,9 @@ df1_fig4.update_layout(hovermode="x unified")
 ###################################
 
 ################ CHART START ###################
-df4_fig1 = px.bar(df4,
-              x="DATE",
-              y="NEW_USERS",
-              color="PERIOD",
-              title="Uniswap Daily New Users")
-df4_fig1.update_layout(hovermode="x unified")
+df4_fig1 = Chart("df4",
+                 y="NEW_USERS",
+                 title="Uniswap Daily New Users")
 ################### CHART END ##################
 
 ###################################
@@ -165,12 +100,12 @@ df4_fig1.update_layout(hovermode="x unified")
 ###################################
 
 ################ CHART START ###################
-df6_fig1 = px.area(df6,
-              x="DATE",
-              y="PCT_SHARE",
-              color="DEX",
-              title="Daily Market Share of DEXs by USD Swap Volume")
-df6_fig1.update_layout(hovermode="x unified")
+df6_fig1 = Chart("df6",
+                 y="PCT_SHARE",
+                 color="DEX",
+                 kind="area",
+                 top_n=8,
+                 title="Daily Market Share of DEXs by USD Swap Volume")
 ################### CHART END ##################
 
 ###################################
@@ -178,12 +113,12 @@ df6_fig1.update_layout(hovermode="x unified")
 ###################################
 
 ################ CHART START ###################
-df7_fig1 = px.area(df7,
-              x="DATE",
-              y="PCT_SHARE",
-              color="DEX",
-              title="Daily Market Share of DEXs by Active Users")
-df7_fig1.update_layout(hovermode="x unified")
+df7_fig1 = Chart("df7",
+                 y="PCT_SHARE",
+                 color="DEX",
+                 kind="area",
+                 top_n=8,
+                 title="Daily Market Share of DEXs by Active Users")
 ################### CHART END ##################
 
 ###################################
@@ -191,12 +126,12 @@ df7_fig1.update_layout(hovermode="x unified")
 ###################################
 
 ################ CHART START ###################
-df8_fig1 = px.area(df8,
-              x="DATE",
-              y="PCT_SHARE",
-              color="DEX",
-              title="Daily Market Share of DEXs by Number of Swaps")
-df8_fig1.update_layout(hovermode="x unified")
+df8_fig1 = Chart("df8",
+                 y="PCT_SHARE",
+                 color="DEX",
+                 kind="area",
+                 top_n=8,
+                 title="Daily Market Share of DEXs by Number of Swaps")
 ################### CHART END ##################
 
 
@@ -206,12 +141,9 @@ df8_fig1.update_layout(hovermode="x unified")
 ###################################
 
 ################ CHART START ###################
-df10_fig1 = px.bar(df10,
-              x="DATE",
-              y="NEW_POOLS_CREATED",
-              color="PERIOD",
-              title="Daily New Uniswap Pools Created")
-df10_fig1.update_layout(hovermode="x unified")
+df10_fig1 = Chart("df10",
+                  y="NEW_POOLS_CREATED",
+                  title="Daily New Uniswap Pools Created")
 ################### CHART END ##################
 
 
@@ -220,29 +152,19 @@ df10_fig1.update_layout(hovermode="x unified")
 ######## LAYOUT #########
 ###################################
 
-col_1a, col_1b = st.columns(2)
-with col_1a:
-    st.plotly_chart(df1_fig1, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url1}")
-with col_1b:
-    st.plotly_chart(df1_fig2, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url1}")
-
-col_2a, col_2b = st.columns(2)
-with col_2a:
-    st.plotly_chart(df4_fig1, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url4}")
-with col_2b:
-    st.plotly_chart(df1_fig4, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url1}")
-
-col_3a, col_3b = st.columns(2)
-with col_3a:
-    st.plotly_chart(df1_fig4, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url1}")
-with col_3b:
-    st.plotly_chart(df10_fig1, theme="streamlit", use_container_width=True)
-    st.link_button("View SQL", f"{url10}")
+render_grid([
+    (df1_fig1, df1_fig2),
+    (df4_fig1, df1_fig3),
+    (df1_fig4, df10_fig1),
+])
+
+###################################
+######## PERIOD AVERAGES ##########
+###################################
+
+metric_cards("df1", "VOLUME_USD", "Avg Daily Volume (USD)")
+metric_cards("df1", "UNIQUE_SWAPPERS", "Avg Daily Unique Swappers")
+metric_cards("df1", "SWAPS", "Avg Daily Swap Count")
 
 insight_1a = '<p style="font-family:sans-serif; color:#4d372c; font-size: 18px;">The introduction of a 0.15% fee had minimal impact on user behavior and Uniswap usage. However, when the fee was increased to 0.25%, we observed a significant short-lived decline in volume, active users, and other metrics. This suggests a critical threshold was crossed, triggering short-term changes in user behavior.</p>'
 
@@ -261,14 +183,17 @@ colored_header(
     color_name="gray-70",
 )
 
-st.plotly_chart(df6_fig1, theme="streamlit", use_container_width=True)
-st.link_button("View SQL", f"{url6}")
+rivals = st.multiselect(
+    "Compare Uniswap's share against",
+    [dex for dex in dexes() if dex not in ALWAYS_SHOWN and dex != OTHER],
+    help="Shares are recomputed within Uniswap and the selected DEXs only. Leave empty for the whole market.")
+universe = (*ALWAYS_SHOWN, *rivals) if rivals else None
 
-st.plotly_chart(df7_fig1, theme="streamlit", use_container_width=True)
-st.link_button("View SQL", f"{url7}")
+render(replace(df6_fig1, universe=universe))
 
-st.plotly_chart(df8_fig1, theme="streamlit", use_container_width=True)
-st.link_button("View SQL", f"{url8}")
+render(replace(df7_fig1, universe=universe))
+
+render(replace(df8_fig1, universe=universe))
 
 insight_2a = '<p style="font-family:sans-serif; color:#4d372c; font-size: 18px;">Since the introduction of the initial fee, Uniswap\'s market share by volume decreased significantly from 50% to 30% by mid-March 2024. Concurrently, PancakeSwap emerged as one of the primary beneficiaries, increasing its market share from 13% to 27% during the same period. This shift suggests that PancakeSwap may have capitalized on Uniswap\'s fee introduction, potentially by maintaining lower fees or offering other incentives to attract users.</p>'
 
@@ -295,3 +220,6 @@ colored_header(
     description="",
     color_name="gray-70",
 )
+
+debug_panel()
+profile_panel()